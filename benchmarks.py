@@ -0,0 +1,409 @@
+import argparse
+import contextlib
+import datetime
+import functools
+import json
+import os
+import platform
+import shutil
+import string
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from prettytable import PrettyTable
+
+from canon import get_canon
+from create_plan import (
+    HTML_TEMPLATE_FILENAME,
+    ONE_BIG_TABLE_TEMPLATE_FILENAME,
+    OUTPUTS,
+    BookGroup,
+    ChapterIndex,
+    PlanPosition,
+    PlanSpec,
+    get_book_groups,
+    get_date_range,
+    get_formatted_full_date,
+    get_month_heading,
+    get_months_with_start_days,
+    get_plan_readings,
+    get_plan_readings_formatted,
+    get_plan_spec,
+    get_readings_output_jobs,
+    get_readings_sinks,
+    write_plan,
+    write_readings_to_csv,
+    write_readings_to_html,
+)
+from create_playlists import PlaylistSink
+from output_scheduler import OutputJob, write_outputs
+from plan_defaults import BIBLE_BOOK_INFO_FILENAME, START_DATE
+
+YEARS_IN_PLANS = [1, 10, 100]
+HTML_WRITER_YEARS_IN_PLANS = [1, 10, 50]
+SYNTHETIC_GROUP_COUNTS = [40]
+BOOKS_PER_SYNTHETIC_GROUP = 5
+RESULTS_FILENAME = "benchmark-results.json"
+
+# Files the benchmarked code reads from the current folder
+INPUT_FILENAMES = [BIBLE_BOOK_INFO_FILENAME, HTML_TEMPLATE_FILENAME, ONE_BIG_TABLE_TEMPLATE_FILENAME]
+
+
+def write_readings_to_html_with_prettytable(
+    plan_readings: list[dict[str, str]],
+    csv_file_prefix: str,
+    start_date: datetime.date,
+    end_date: datetime.date,
+):
+    """The HTML writer as it was before html_tables, kept to measure against"""
+
+    date_range = get_date_range(start_date, end_date)
+    table = PrettyTable(list(plan_readings[0].keys()))
+    for days_readings in plan_readings:
+        table.add_row(list(days_readings.values()))
+
+    with open(f"{csv_file_prefix}-{date_range}-table.html", "w", encoding="utf-8") as html_file:
+        html_file.writelines(table.get_html_string())
+
+    with open(HTML_TEMPLATE_FILENAME, "r", encoding="utf-8") as template_file:
+        text_template = string.Template(template_file.read())
+
+    headings_and_tables: list[str] = []
+    months_with_start_days = get_months_with_start_days(start_date, end_date)
+    for index, month_with_start_day in enumerate(months_with_start_days):
+        end_day = months_with_start_days[index + 1].day if index + 1 < len(months_with_start_days) else len(table.rows)
+        headings_and_tables.append(
+            f"{get_month_heading(month_with_start_day.month_name)}"
+            f"{table[month_with_start_day.day:end_day].get_html_string()}"
+        )
+
+    readings = text_template.substitute(
+        plan_dates=f"{get_formatted_full_date(start_date)} to {get_formatted_full_date(end_date)}",
+        headings_and_tables="\n".join(headings_and_tables),
+    )
+    readings = readings.replace("<table>", '<table role="presentation">')
+    with open(f"{csv_file_prefix}-{date_range}.html", "w", encoding="utf-8") as html_file:
+        html_file.writelines(readings)
+
+
+def time_html_writer(write_html, plan_readings, csv_file_prefix, start_date, end_date) -> float:
+    start_time = time.perf_counter()
+    write_html(plan_readings, csv_file_prefix, start_date, end_date)
+    return time.perf_counter() - start_time
+
+
+@contextlib.contextmanager
+def in_temp_folder():
+    """Runs the enclosed code in a temporary folder holding copies of the input files"""
+
+    input_paths = [Path(filename).resolve() for filename in INPUT_FILENAMES]
+    original_folder = os.getcwd()
+    with tempfile.TemporaryDirectory() as temp_folder:
+        for input_path in input_paths:
+            shutil.copy(input_path, temp_folder)
+        os.chdir(temp_folder)
+        try:
+            yield Path(temp_folder)
+        finally:
+            os.chdir(original_folder)
+
+
+def benchmark_html_writers():
+    canon = get_canon()
+    abbreviations = dict(canon.abbreviations)
+    chapter_index = ChapterIndex(canon)
+    plan_spec = get_plan_spec(get_book_groups(), chapter_index)
+
+    print("Years  PrettyTable (s)  html_tables (s)  Speedup")
+    with in_temp_folder():
+        for years_in_plan in HTML_WRITER_YEARS_IN_PLANS:
+            end_date = get_end_date(years_in_plan)
+            plan_readings_raw = get_plan_readings(
+                START_DATE, end_date, chapter_index, plan_spec, plan_spec.get_position(START_DATE)
+            )
+            plan_readings = get_plan_readings_formatted(plan_readings_raw, abbreviations, chapter_index)
+
+            prettytable_seconds = time_html_writer(
+                write_readings_to_html_with_prettytable, plan_readings, "prettytable", START_DATE, end_date
+            )
+            html_tables_seconds = time_html_writer(
+                write_readings_to_html, plan_readings, "html_tables", START_DATE, end_date
+            )
+
+            date_range = get_date_range(START_DATE, end_date)
+            for suffix in [".html", "-table.html"]:
+                if Path(f"prettytable-{date_range}{suffix}").read_text(encoding="utf-8") != Path(
+                    f"html_tables-{date_range}{suffix}"
+                ).read_text(encoding="utf-8"):
+                    raise AssertionError(f"The {suffix} markup written by the two HTML writers differs")
+
+            print(
+                f"{years_in_plan:5}  {prettytable_seconds:15.3f}  {html_tables_seconds:15.3f}"
+                f"  {prettytable_seconds / html_tables_seconds:6.1f}x"
+            )
+
+
+def get_end_date(years_in_plan: int) -> datetime.date:
+    return datetime.date(START_DATE.year + years_in_plan, 1, 1) - datetime.timedelta(days=1)
+
+
+def get_synthetic_book_groups(number_of_groups: int, books: list[str]) -> list[BookGroup]:
+    """Returns number_of_groups groups, each of BOOKS_PER_SYNTHETIC_GROUP consecutive books (wrapping around from
+    Revelation to Genesis), each group starting one book after the one before it"""
+
+    return [
+        BookGroup(
+            f"Group{group_number + 1}",
+            [books[(group_number + offset) % len(books)] for offset in range(BOOKS_PER_SYNTHETIC_GROUP)],
+        )
+        for group_number in range(number_of_groups)
+    ]
+
+
+def get_book_group_sets(
+    books: list[str], synthetic_group_counts: list[int]
+) -> dict[str, Callable[[], list[BookGroup]]]:
+    """Returns a function that makes the book groups, for each set of groups"""
+
+    book_group_sets: dict[str, Callable[[], list[BookGroup]]] = {"default": get_book_groups}
+    for number_of_groups in synthetic_group_counts:
+        book_group_sets[f"synthetic-{number_of_groups}"] = lambda n=number_of_groups: get_synthetic_book_groups(
+            n, books
+        )
+
+    return book_group_sets
+
+
+def time_stage(function: Callable, repeats: int, setup: Callable = lambda: None):
+    """Returns the fastest of repeats runs of function (each after a call to setup, which isn't timed) and the last
+    run's result"""
+
+    seconds: list[float] = []
+    for _ in range(repeats):
+        setup()
+        start_time = time.perf_counter()
+        result = function()
+        seconds.append(time.perf_counter() - start_time)
+
+    return min(seconds), result
+
+
+def get_every_output_job(
+    output_folder: Path,
+    end_date: datetime.date,
+    plan_spec: PlanSpec,
+    plan_position: PlanPosition,
+    abbreviations: dict[str, str],
+    chapter_index: ChapterIndex,
+    playlists: bool,
+) -> list[OutputJob]:
+    output_jobs = get_readings_output_jobs(
+        output_folder, START_DATE, end_date, plan_spec, plan_position, abbreviations, chapter_index, outputs=OUTPUTS
+    )
+    if playlists:
+        output_jobs.append(
+            OutputJob("playlists", functools.partial(PlaylistSink, chapter_index, m3us_folder=output_folder / "m3us"))
+        )
+
+    return output_jobs
+
+
+def write_every_output_concurrently(output_jobs: list[OutputJob], plan_matrix):
+    errors = write_outputs(START_DATE, plan_matrix, output_jobs)
+    if errors:
+        raise RuntimeError(f"Some outputs couldn't be written: {errors}")
+
+
+def run_benchmarks(
+    years_in_plans: list[int], synthetic_group_counts: list[int], repeats: int, playlists: bool = True
+) -> list[dict]:
+    """Times each stage of producing the plan's outputs, for each plan length and set of groups"""
+
+    canon = get_canon()
+    abbreviations = dict(canon.abbreviations)
+    chapter_index = ChapterIndex(canon)
+    results: list[dict] = []
+
+    with in_temp_folder() as temp_folder:
+        m3us_folder = temp_folder / "m3us"
+        for group_set_name, get_group_set in get_book_group_sets(chapter_index.books, synthetic_group_counts).items():
+            for years_in_plan in years_in_plans:
+                end_date = get_end_date(years_in_plan)
+                date_range = get_date_range(START_DATE, end_date)
+                stage_seconds: dict[str, float] = {}
+                plan_spec = get_plan_spec(get_group_set(), chapter_index)
+                plan_position = plan_spec.get_position(START_DATE)
+
+                stage_seconds["get_plan_readings"], plan_readings_raw = time_stage(
+                    lambda: get_plan_readings(START_DATE, end_date, chapter_index, plan_spec, plan_position), repeats
+                )
+                stage_seconds["get_plan_readings_formatted"], plan_readings = time_stage(
+                    lambda: get_plan_readings_formatted(plan_readings_raw, abbreviations, chapter_index), repeats
+                )
+                stage_seconds["write_readings_to_csv"], _ = time_stage(
+                    lambda: write_readings_to_csv(plan_readings, "horner-classic-formatted", date_range), repeats
+                )
+                stage_seconds["write_readings_to_html"], _ = time_stage(
+                    lambda: write_readings_to_html(plan_readings, "horner-classic-formatted", START_DATE, end_date),
+                    repeats,
+                )
+                stage_seconds["one_big_table_html"], _ = time_stage(
+                    lambda: write_plan(
+                        START_DATE,
+                        end_date,
+                        plan_spec,
+                        plan_position,
+                        get_readings_sinks(
+                            temp_folder,
+                            START_DATE,
+                            end_date,
+                            plan_spec,
+                            plan_position,
+                            abbreviations,
+                            chapter_index,
+                            outputs=["one_big_table_html"],
+                        ),
+                    ),
+                    repeats,
+                )
+                if playlists:
+                    stage_seconds["create_playlists"], _ = time_stage(
+                        lambda: write_plan(
+                            START_DATE,
+                            end_date,
+                            plan_spec,
+                            plan_position,
+                            [PlaylistSink(chapter_index, m3us_folder=m3us_folder)],
+                        ),
+                        repeats,
+                        setup=lambda: shutil.rmtree(m3us_folder, ignore_errors=True),
+                    )
+                    shutil.rmtree(m3us_folder, ignore_errors=True)
+
+                # Every output, first one after another (in a single pass over the plan), and then all at once
+                get_output_jobs = functools.partial(
+                    get_every_output_job,
+                    temp_folder,
+                    end_date,
+                    plan_spec,
+                    plan_position,
+                    abbreviations,
+                    chapter_index,
+                    playlists,
+                )
+                stage_seconds["write_plan (every output)"], _ = time_stage(
+                    lambda: write_plan(
+                        START_DATE,
+                        end_date,
+                        plan_spec,
+                        plan_position,
+                        [output_job.make_sink() for output_job in get_output_jobs()],
+                    ),
+                    repeats,
+                    setup=lambda: shutil.rmtree(m3us_folder, ignore_errors=True),
+                )
+                stage_seconds["write_outputs (every output)"], _ = time_stage(
+                    lambda: write_every_output_concurrently(
+                        get_output_jobs(),
+                        plan_spec.get_plan_matrix(plan_position, START_DATE, end_date),
+                    ),
+                    repeats,
+                    setup=lambda: shutil.rmtree(m3us_folder, ignore_errors=True),
+                )
+                shutil.rmtree(m3us_folder, ignore_errors=True)
+
+                for stage, seconds in stage_seconds.items():
+                    results.append(
+                        {
+                            "stage": stage,
+                            "group_set": group_set_name,
+                            "groups": len(plan_readings[0]) - 1,
+                            "years": years_in_plan,
+                            "days": len(plan_readings),
+                            "seconds": round(seconds, 6),
+                        }
+                    )
+                    print(f"{stage:40} {group_set_name:14} {years_in_plan:5} years {seconds:10.3f}s")
+
+    return results
+
+
+def get_result_key(result: dict) -> tuple[str, str, int]:
+    return result["stage"], result["group_set"], result["years"]
+
+
+def get_git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, check=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(results: list[dict], results_filename: str):
+    Path(results_filename).write_text(
+        json.dumps(
+            {
+                "commit": get_git_commit(),
+                "created": datetime.datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "results": results,
+            },
+            indent=4,
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+
+
+def compare_results(results: list[dict], baseline_filename: str):
+    """Prints how each stage's time compares with that in an earlier results file"""
+
+    baseline = json.loads(Path(baseline_filename).read_text(encoding="utf-8"))
+    baseline_seconds = {get_result_key(result): result["seconds"] for result in baseline["results"]}
+    print(f"\nCompared with {baseline_filename} (commit {baseline.get('commit')}), as a multiple of its time")
+    for result in results:
+        key = get_result_key(result)
+        if key in baseline_seconds and baseline_seconds[key]:
+            stage, group_set_name, years_in_plan = key
+            ratio = result["seconds"] / baseline_seconds[key]
+            print(f"{stage:40} {group_set_name:14} {years_in_plan:5} years {ratio:9.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time each stage of producing the plan's outputs")
+    parser.add_argument("--years", type=int, nargs="+", default=YEARS_IN_PLANS, help="plan lengths, in years")
+    parser.add_argument(
+        "--synthetic-groups",
+        type=int,
+        nargs="*",
+        default=SYNTHETIC_GROUP_COUNTS,
+        help="numbers of groups in the synthetic group sets run besides the default ten groups",
+    )
+    parser.add_argument("--repeats", type=int, default=3, help="runs of each stage, of which the fastest is reported")
+    parser.add_argument("--no-playlists", action="store_true", help="skip writing the playlists")
+    parser.add_argument("--output", default=RESULTS_FILENAME, help="JSON file the results are written to")
+    parser.add_argument("--compare", help="JSON results file, from an earlier run, to compare the results with")
+    parser.add_argument(
+        "--html-writers", action="store_true", help="instead, compare the HTML writer with the PrettyTable one"
+    )
+    args = parser.parse_args()
+
+    if args.html_writers:
+        benchmark_html_writers()
+        return
+
+    results = run_benchmarks(args.years, args.synthetic_groups, args.repeats, not args.no_playlists)
+    write_results(results, args.output)
+    print(f"\nWrote the results to {args.output}")
+    if args.compare:
+        compare_results(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
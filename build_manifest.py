@@ -0,0 +1,48 @@
+import hashlib
+import json
+from pathlib import Path
+
+MANIFEST_FILENAME = "build-manifest.json"
+
+# Change this whenever a change to the code changes what's written for the same inputs, so that everything is rebuilt
+MANIFEST_VERSION = "1"
+
+
+def get_hash(*parts: str) -> str:
+    hash = hashlib.sha256(MANIFEST_VERSION.encode())
+    for part in parts:
+        hash.update(b"\0")
+        hash.update(part.encode())
+    return hash.hexdigest()
+
+
+def get_file_hash(filename: str | Path) -> str:
+    return hashlib.sha256(Path(filename).read_bytes()).hexdigest()
+
+
+class BuildManifest:
+    """Remembers the hash of the inputs each file was last written from, so that files whose inputs haven't changed
+    needn't be written again"""
+
+    filename: Path
+    input_hashes: dict[str, str]  # Keyed by the written file's name
+    force: bool
+
+    def __init__(self, filename: Path = Path(MANIFEST_FILENAME), force: bool = False):
+        self.filename = filename
+        self.input_hashes = json.loads(filename.read_text(encoding="utf-8")) if filename.exists() else {}
+        self.force = force
+
+    def is_up_to_date(self, filenames: list[Path], input_hash: str) -> bool:
+        """Returns whether every one of the files exists, and was last written from inputs with input_hash"""
+
+        return not self.force and all(
+            self.input_hashes.get(str(filename)) == input_hash and filename.exists() for filename in filenames
+        )
+
+    def record(self, filenames: list[Path], input_hash: str):
+        for filename in filenames:
+            self.input_hashes[str(filename)] = input_hash
+
+    def save(self):
+        self.filename.write_text(json.dumps(self.input_hashes, indent=0, sort_keys=True), encoding="utf-8")
@@ -0,0 +1,164 @@
+"""The Bible's canon (each book's abbreviation, number of chapters, testament and first chapter id), loaded just once
+and shared, read-only, by every module
+
+get_canon() takes it from canon_data.py, which running this module generates from bible_book_info.csv, so that nothing
+has to be parsed at startup. Without canon_data.py, bible_book_info.csv is parsed instead.
+"""
+
+import os
+import sys
+from types import MappingProxyType
+
+from plan_defaults import BIBLE_BOOK_INFO_FILENAME
+
+CANON_DATA_FILENAME = "canon_data.py"
+USAGE = (
+    f"usage: canon.py [--check]\n\nGenerates {CANON_DATA_FILENAME} from {BIBLE_BOOK_INFO_FILENAME}, or just checks"
+    " that it's up to date"
+)
+OLD_TESTAMENT = "ot"
+NEW_TESTAMENT = "nt"
+FIRST_NEW_TESTAMENT_BOOK = "Matthew"
+
+
+class Canon:
+    """The books of the Bible, in order, each with its abbreviation and integer metadata
+
+    Chapter ids run from 0 (Genesis 1) to number_of_chapters - 1 (Revelation 22), each book's starting at its
+    first_chapter_ids entry (the sum of the chapter counts of the books before it).
+    """
+
+    __slots__ = (
+        "book_info",
+        "books",
+        "abbreviations",
+        "chapter_counts",
+        "book_ordinals",
+        "testaments",
+        "first_chapter_ids",
+        "number_of_chapters",
+    )
+
+    book_info: tuple[tuple[str, str, int], ...]  # Each book's name, abbreviation and number of chapters
+    books: tuple[str, ...]
+    abbreviations: MappingProxyType[str, str]
+    chapter_counts: MappingProxyType[str, int]
+    book_ordinals: MappingProxyType[str, int]  # 0-based position of each book in books
+    testaments: MappingProxyType[str, str]  # OLD_TESTAMENT or NEW_TESTAMENT
+    first_chapter_ids: MappingProxyType[str, int]
+    number_of_chapters: int
+
+    def __init__(self, book_info: tuple[tuple[str, str, int], ...]):
+        books = tuple(book for book, _, _ in book_info)
+        first_chapter_ids: dict[str, int] = {}
+        number_of_chapters = 0
+        for book, _, chapter_count in book_info:
+            first_chapter_ids[book] = number_of_chapters
+            number_of_chapters += chapter_count
+        new_testament_ordinal = (
+            books.index(FIRST_NEW_TESTAMENT_BOOK) if FIRST_NEW_TESTAMENT_BOOK in books else len(books)
+        )
+
+        for name, value in (
+            ("book_info", book_info),
+            ("books", books),
+            ("abbreviations", MappingProxyType({book: abbreviation for book, abbreviation, _ in book_info})),
+            ("chapter_counts", MappingProxyType({book: chapter_count for book, _, chapter_count in book_info})),
+            ("book_ordinals", MappingProxyType({book: book_ordinal for book_ordinal, book in enumerate(books)})),
+            (
+                "testaments",
+                MappingProxyType(
+                    {
+                        book: OLD_TESTAMENT if book_ordinal < new_testament_ordinal else NEW_TESTAMENT
+                        for book_ordinal, book in enumerate(books)
+                    }
+                ),
+            ),
+            ("first_chapter_ids", MappingProxyType(first_chapter_ids)),
+            ("number_of_chapters", number_of_chapters),
+        ):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value):
+        raise AttributeError(f"The canon is read-only (so {name} can't be set).")
+
+    def __reduce__(self):
+        # The mapping proxies can't be pickled, so processes are sent just book_info, from which they're rebuilt
+        return Canon, (self.book_info,)
+
+    def get_testament_book_number(self, book: str) -> int:
+        """Returns the book's 1-based position in its testament"""
+
+        book_ordinal = self.book_ordinals[book]
+        if self.testaments[book] == OLD_TESTAMENT:
+            return book_ordinal + 1
+        return book_ordinal - self.book_ordinals[FIRST_NEW_TESTAMENT_BOOK] + 1
+
+
+def read_canon(filename: str) -> Canon:
+    import csv  # Only needed when canon_data.py is missing, so that today.py doesn't usually import it
+
+    with open(filename, "r", encoding="utf-8") as csv_file:
+        return Canon(
+            tuple((row["book"], row["abbreviation"], int(row["chapters"])) for row in csv.DictReader(csv_file))
+        )
+
+
+def get_canon_data_filename(filename: str) -> str:
+    """Returns the path of filename next to this module, whichever folder it's run from"""
+
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
+
+
+# Set by get_canon()
+canon: Canon | None = None
+
+
+def get_canon() -> Canon:
+    global canon
+    if canon is None:
+        try:
+            from canon_data import BOOK_INFO
+        except ImportError:
+            canon = read_canon(get_canon_data_filename(BIBLE_BOOK_INFO_FILENAME))
+        else:
+            canon = Canon(BOOK_INFO)
+
+    return canon
+
+
+def write_canon_data(book_info: tuple[tuple[str, str, int], ...], filename: str):
+    with open(filename, "w", encoding="utf-8", newline="\n") as canon_data_file:
+        canon_data_file.write(
+            f"# Generated from {BIBLE_BOOK_INFO_FILENAME} by canon.py (run it again after editing that file)\n\n"
+        )
+        canon_data_file.write("# Each book's name, abbreviation and number of chapters\n")
+        canon_data_file.write("BOOK_INFO = (\n")
+        for book, abbreviation, chapter_count in book_info:
+            canon_data_file.write(f'    ("{book}", "{abbreviation}", {chapter_count}),\n')
+        canon_data_file.write(")\n")
+
+
+def main():
+    # Like today.py, it parses its one option itself, so that importing this module stays quick
+    if sys.argv[1:] not in ([], ["--check"]):
+        print(USAGE)
+        return
+
+    book_info = read_canon(get_canon_data_filename(BIBLE_BOOK_INFO_FILENAME)).book_info
+    if sys.argv[1:] == ["--check"]:
+        try:
+            from canon_data import BOOK_INFO
+        except ImportError:
+            BOOK_INFO = None
+        if BOOK_INFO != book_info:
+            raise SystemExit(f"{CANON_DATA_FILENAME} is out of date; run canon.py to regenerate it.")
+        print(f"{CANON_DATA_FILENAME} is up to date.")
+        return
+
+    write_canon_data(book_info, get_canon_data_filename(CANON_DATA_FILENAME))
+    print(f"Wrote {CANON_DATA_FILENAME} ({len(book_info)} books)")
+
+
+if __name__ == "__main__":
+    main()
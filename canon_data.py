@@ -0,0 +1,71 @@
+# Generated from bible_book_info.csv by canon.py (run it again after editing that file)
+
+# Each book's name, abbreviation and number of chapters
+BOOK_INFO = (
+    ("Genesis", "Gen", 50),
+    ("Exodus", "Exod", 40),
+    ("Leviticus", "Lev", 27),
+    ("Numbers", "Num", 36),
+    ("Deuteronomy", "Deut", 34),
+    ("Joshua", "Joshua", 24),
+    ("Judges", "Judges", 21),
+    ("Ruth", "Ruth", 4),
+    ("1 Samuel", "1Sam", 31),
+    ("2 Samuel", "2Sam", 24),
+    ("1 Kings", "1Kings", 22),
+    ("2 Kings", "2Kings", 25),
+    ("1 Chronicles", "1Chron", 29),
+    ("2 Chronicles", "2Chron", 36),
+    ("Ezra", "Ezra", 10),
+    ("Nehemiah", "Neh", 13),
+    ("Esther", "Esth", 10),
+    ("Job", "Job", 42),
+    ("Psalms", "Psalm", 150),
+    ("Proverbs", "Prov", 31),
+    ("Ecclesiastes", "Eccles", 12),
+    ("Song of Songs", "Song", 8),
+    ("Isaiah", "Isaiah", 66),
+    ("Jeremiah", "Jer", 52),
+    ("Lamentations", "Lam", 5),
+    ("Ezekiel", "Ezek", 48),
+    ("Daniel", "Daniel", 12),
+    ("Hosea", "Hosea", 14),
+    ("Joel", "Joel", 3),
+    ("Amos", "Amos", 9),
+    ("Obadiah", "Obad", 1),
+    ("Jonah", "Jonah", 4),
+    ("Micah", "Micah", 7),
+    ("Nahum", "Nahum", 3),
+    ("Habakkuk", "Hab", 3),
+    ("Zephaniah", "Zeph", 3),
+    ("Haggai", "Haggai", 2),
+    ("Zechariah", "Zec", 14),
+    ("Malachi", "Mal", 4),
+    ("Matthew", "Matt", 28),
+    ("Mark", "Mark", 16),
+    ("Luke", "Luke", 24),
+    ("John", "John", 21),
+    ("Acts", "Acts", 28),
+    ("Romans", "Romans", 16),
+    ("1 Corinthians", "1Cor", 16),
+    ("2 Corinthians", "2Cor", 13),
+    ("Galatians", "Gal", 6),
+    ("Ephesians", "Eph", 6),
+    ("Philippians", "Phil", 4),
+    ("Colossians", "Col", 4),
+    ("1 Thessalonians", "1Thess", 5),
+    ("2 Thessalonians", "2Thess", 3),
+    ("1 Timothy", "1Tim", 6),
+    ("2 Timothy", "2Tim", 4),
+    ("Titus", "Titus", 3),
+    ("Philemon", "Phm", 1),
+    ("Hebrews", "Heb", 13),
+    ("James", "James", 5),
+    ("1 Peter", "1Peter", 5),
+    ("2 Peter", "2Peter", 3),
+    ("1 John", "1John", 5),
+    ("2 John", "2John", 1),
+    ("3 John", "3John", 1),
+    ("Jude", "Jude", 1),
+    ("Revelation", "Rev", 22),
+)
@@ -0,0 +1,157 @@
+import argparse
+import datetime
+from dataclasses import dataclass
+
+from canon import get_canon
+from create_plan import START_DATE, ChapterIndex, PlanPosition, PlanSpec, get_book_groups, get_plan_spec
+
+# How a reader who's missed days catches up: by picking up where they left off (so their plan runs that many days
+# late from then on), by skipping the missed chapters to read what the calendar says, or by reading the missed
+# chapters along with each day's own, spread over the next few days, until they're back on the calendar
+CATCH_UP_POLICIES = ["resume", "skip", "spread"]
+SPREAD_DAYS = 7
+
+
+@dataclass(frozen=True)
+class CatchUp:
+    """A reader's readings from the day they're back: each group reads one chapter a day from its position on the
+    plan position's date, along with its extra chapters, spread evenly over the first spread_days days"""
+
+    plan_position: PlanPosition
+    extra_chapters: tuple[int, ...]
+    spread_days: int = 1
+
+    @property
+    def end_date(self) -> datetime.date:
+        """Returns the last day on which extra chapters are read"""
+        return self.plan_position.date + datetime.timedelta(days=self.spread_days - 1)
+
+    def get_position(self, plan_spec: PlanSpec, date: datetime.date) -> PlanPosition:
+        """Returns each group's position at the start of date (from the day the reader's back on), from which the
+        reader's ordinary plan carries on once date is after end_date"""
+
+        days_elapsed = (date - self.plan_position.date).days
+        if days_elapsed < 0:
+            raise ValueError(f"The date ({date}) is before the day the reader's back ({self.plan_position.date}).")
+        days_spread = min(days_elapsed, self.spread_days)
+        return PlanPosition(
+            date,
+            tuple(
+                (reading_index + days_elapsed + extra_chapters * days_spread // self.spread_days)
+                % len(group.chapter_ids)
+                for group, reading_index, extra_chapters in zip(
+                    plan_spec.groups, self.plan_position.reading_indexes, self.extra_chapters
+                )
+            ),
+        )
+
+    def get_chapter_ids(self, plan_spec: PlanSpec, date: datetime.date) -> list[list[int]]:
+        """Returns each group's chapter ids on date (from the day the reader's back on), which are more than one for
+        a group with extra chapters to read that day"""
+
+        first_reading_indexes = self.get_position(plan_spec, date).reading_indexes
+        days_elapsed = (date - self.plan_position.date).days
+        days_spread = min(days_elapsed, self.spread_days)
+        next_days_spread = min(days_elapsed + 1, self.spread_days)
+        return [
+            [
+                group.chapter_ids[(first_reading_index + chapter) % len(group.chapter_ids)]
+                for chapter in range(
+                    1
+                    + extra_chapters * next_days_spread // self.spread_days
+                    - extra_chapters * days_spread // self.spread_days
+                )
+            ]
+            for group, first_reading_index, extra_chapters in zip(
+                plan_spec.groups, first_reading_indexes, self.extra_chapters
+            )
+        ]
+
+
+def get_catch_up(
+    plan_spec: PlanSpec,
+    plan_position: PlanPosition,
+    last_completed_date: datetime.date,
+    back_date: datetime.date,
+    policy: str,
+    spread_days: int = SPREAD_DAYS,
+) -> CatchUp:
+    """Returns how a reader whose plan is at plan_position, and who last finished a day's readings on
+    last_completed_date, reads from back_date on, under the policy
+
+    It takes the same time however many days were missed. A group that missed more than its whole cycle only has to
+    catch up on what's left over after the whole cycles (which lands it on the same position).
+    """
+
+    if policy not in CATCH_UP_POLICIES:
+        raise ValueError(f"The policy ('{policy}') must be one of: {', '.join(CATCH_UP_POLICIES)}")
+    if back_date <= last_completed_date:
+        raise ValueError(f"The day the reader's back ({back_date}) must be after the last day they completed.")
+    if spread_days < 1:
+        raise ValueError(f"The missed chapters must be spread over at least 1 day (not {spread_days}).")
+
+    missed_days = (back_date - last_completed_date).days - 1
+    if policy == "skip":
+        return CatchUp(plan_spec.move(plan_position, back_date), (0,) * len(plan_spec.groups))
+
+    next_position = plan_spec.move(plan_position, last_completed_date + datetime.timedelta(days=1))
+    resume_position = PlanPosition(back_date, next_position.reading_indexes)
+    if policy == "resume":
+        return CatchUp(resume_position, (0,) * len(plan_spec.groups))
+    return CatchUp(
+        resume_position,
+        tuple(missed_days % len(group.chapter_ids) for group in plan_spec.groups),
+        spread_days,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show a reader's readings after missed days, under a catch-up policy")
+    parser.add_argument(
+        "last_completed_date", type=datetime.date.fromisoformat, help="the last day whose readings were all read"
+    )
+    parser.add_argument("--policy", choices=CATCH_UP_POLICIES, default="spread")
+    parser.add_argument(
+        "--spread-days",
+        type=int,
+        default=SPREAD_DAYS,
+        help="number of days the spread policy reads the missed chapters over (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--date",
+        type=datetime.date.fromisoformat,
+        default=datetime.date.today(),
+        help="the day the reader's back (default: today)",
+    )
+    parser.add_argument(
+        "--start-date",
+        type=datetime.date.fromisoformat,
+        default=START_DATE,
+        help="the plan's first day, on which every group is at its first chapter (default: %(default)s)",
+    )
+    parser.add_argument("--days", type=int, default=SPREAD_DAYS, help="number of days to show (default: %(default)s)")
+    args = parser.parse_args()
+
+    chapter_index = ChapterIndex(get_canon())
+    plan_spec = get_plan_spec(get_book_groups(), chapter_index)
+    try:
+        catch_up = get_catch_up(
+            plan_spec,
+            plan_spec.get_position(args.start_date),
+            args.last_completed_date,
+            args.date,
+            args.policy,
+            args.spread_days,
+        )
+    except ValueError as error:
+        parser.error(str(error))
+
+    for day in range(args.days):
+        date = args.date + datetime.timedelta(days=day)
+        print(f"{date} ({date:%a})")
+        for group_name, chapter_ids in zip(plan_spec.group_names, catch_up.get_chapter_ids(plan_spec, date)):
+            print(f"\t{group_name}: {', '.join(chapter_index.readings[chapter_id] for chapter_id in chapter_ids)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import argparse
+import csv
+import datetime
+import sys
+
+from canon import get_canon
+from create_plan import START_DATE, ChapterIndex, PlanPosition, PlanSpec, get_book_groups, get_plan_spec
+
+
+def get_chapter_positions(plan_spec: PlanSpec) -> dict[int, list[tuple[int, int]]]:
+    """Returns, for each chapter id read by any of the groups, the index of each group that reads it along with the
+    chapter's (0-based) position in that group's cycle"""
+
+    chapter_positions: dict[int, list[tuple[int, int]]] = {}
+    for group_index, group in enumerate(plan_spec.groups):
+        for position, chapter_id in enumerate(group.chapter_ids):
+            chapter_positions.setdefault(chapter_id, []).append((group_index, position))
+
+    return chapter_positions
+
+
+def get_reading_dates(
+    chapter_id: int,
+    from_date: datetime.date,
+    to_date: datetime.date,
+    plan_spec: PlanSpec,
+    plan_position: PlanPosition,
+) -> list[tuple[datetime.date, str]]:
+    """Returns each date from from_date thru to_date on which the chapter is read, along with the group reading it,
+    without generating the plan"""
+
+    reading_dates: list[tuple[datetime.date, str]] = []
+    first_day = (from_date - plan_position.date).days
+    last_day = (to_date - plan_position.date).days
+    for group_index, position in get_chapter_positions(plan_spec).get(chapter_id, []):
+        group = plan_spec.groups[group_index]
+        cycle_length = len(group.chapter_ids)
+        # The days on which the group is at position are those congruent to position - reading_index
+        day = first_day + (position - plan_position.reading_indexes[group_index] - first_day) % cycle_length
+        for day in range(day, last_day + 1, cycle_length):
+            reading_dates.append((plan_position.date + datetime.timedelta(days=day), group.group_name))
+
+    return sorted(reading_dates)
+
+
+def get_coverage_counts(
+    from_date: datetime.date,
+    to_date: datetime.date,
+    plan_spec: PlanSpec,
+    plan_position: PlanPosition,
+    chapter_index: ChapterIndex,
+) -> list[int]:
+    """Returns how many times each chapter (indexed by chapter id) is read from from_date thru to_date, working it out
+    from each group's cycle length rather than by generating the plan"""
+
+    coverage_counts = [0] * len(chapter_index.readings)
+    number_of_days = max(0, (to_date - from_date).days + 1)
+    for group, first_position in zip(plan_spec.groups, plan_spec.move(plan_position, from_date).reading_indexes):
+        cycle_length = len(group.chapter_ids)
+        full_cycles, extra_days = divmod(number_of_days, cycle_length)
+        for position, chapter_id in enumerate(group.chapter_ids):
+            # The partial cycle reads the extra_days positions from first_position on, wrapping around
+            in_partial_cycle = (position - first_position) % cycle_length < extra_days
+            coverage_counts[chapter_id] += full_cycles + in_partial_cycle
+
+    return coverage_counts
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="List the dates on which a chapter is read, or how many times each chapter is read, in a range"
+    )
+    parser.add_argument("reading", nargs="?", help='a chapter, like "Psalms 119" (omit it along with --coverage)')
+    parser.add_argument("--from", dest="from_date", type=datetime.date.fromisoformat, required=True)
+    parser.add_argument("--to", dest="to_date", type=datetime.date.fromisoformat, required=True)
+    parser.add_argument(
+        "--start-date",
+        type=datetime.date.fromisoformat,
+        default=START_DATE,
+        help="the plan's first day, on which every group is at its first chapter (default: %(default)s)",
+    )
+    parser.add_argument("--coverage", action="store_true", help="write each chapter's number of readings as CSV")
+    args = parser.parse_args()
+    if bool(args.reading) == args.coverage:
+        parser.error("Give either a reading or --coverage.")
+
+    chapter_index = ChapterIndex(get_canon())
+    plan_spec = get_plan_spec(get_book_groups(), chapter_index)
+    plan_position = plan_spec.get_position(args.start_date)
+
+    if args.coverage:
+        coverage_counts = get_coverage_counts(args.from_date, args.to_date, plan_spec, plan_position, chapter_index)
+        writer = csv.writer(sys.stdout, lineterminator="\n")
+        writer.writerow(["reading", "times_read"])
+        writer.writerows(zip(chapter_index.readings, coverage_counts))
+        return
+
+    try:
+        chapter_id = chapter_index.get_reading_id(args.reading)
+    except ValueError as error:
+        parser.error(str(error))
+    reading_dates = get_reading_dates(chapter_id, args.from_date, args.to_date, plan_spec, plan_position)
+    for date, group_name in reading_dates:
+        print(f"{date} ({date:%a})\t{group_name}")
+    print(f"{args.reading} is read {len(reading_dates)} times from {args.from_date} thru {args.to_date}")
+
+
+if __name__ == "__main__":
+    main()
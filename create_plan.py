@@ -1,113 +1,369 @@
+import argparse
 import calendar
-import csv
 import datetime
-import re
-import string
+import functools
+import json
+import tomllib
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Mapping, TextIO
+
+import numpy as np
+
+from build_manifest import BuildManifest, get_file_hash, get_hash
+from canon import Canon, get_canon
+from html_tables import (
+    HTML_TABLE_END,
+    get_html_table_row,
+    get_html_table_start,
+    get_template_fragments,
+    write_html_table,
+)
+from output_scheduler import OutputJob, write_outputs
+from plan_defaults import BOOK_GROUPS, END_DATE, START_DATE
+from plan_database import PlanDatabaseSink
+from plan_file import PlanFileSink
+from stage_profiler import PROFILE_REPORT_FILENAME, StageProfiler
+
+HTML_TEMPLATE_FILENAME = "horner-classic-formatted-template.html"
+ONE_BIG_TABLE_TEMPLATE_FILENAME = "template4.html"
+ONE_BIG_TABLE_FILENAME = "one-big-table.html"
+MONTH_TABLE_ATTRIBUTES = ' role="presentation"'
+
+# Every output a plan config can ask for, and those get_readings_sinks() writes when not asked for any in particular
+OUTPUTS = ["raw_csv", "formatted_csv", "monthly_html", "one_big_table_html", "plan_file", "sqlite", "playlists"]
+READINGS_OUTPUTS = ["raw_csv", "formatted_csv", "monthly_html"]
+
+
+class ChapterIndex:
+    """Canonical chapter ids for every chapter in the canon, from 0 (Genesis 1) to 1188 (Revelation 22)"""
 
-from prettytable import PrettyTable
+    # Set by constructor
+    canon: Canon
+
+    # Indexed by chapter id
+    book_ordinals: array  # 0-based position of the chapter's book in books
+    chapters: array
+    readings: list[str]
+
+    reading_ids: dict[str, int]
+    reading_labels: dict[tuple[tuple[str, str], ...], list[str]]  # Set by get_reading_labels(), per abbreviation set
+
+    def __init__(self, canon: Canon):
+        self.canon = canon
+        self.book_ordinals = array("H")
+        self.chapters = array("H")
+        self.readings = []
+        for book_ordinal, (book, _, chapter_count) in enumerate(canon.book_info):
+            self.book_ordinals.extend([book_ordinal] * chapter_count)
+            self.chapters.extend(range(1, chapter_count + 1))
+            self.readings.extend(f"{book} {chapter}" for chapter in range(1, chapter_count + 1))
+        self.reading_ids = {reading: chapter_id for chapter_id, reading in enumerate(self.readings)}
+        self.reading_labels = {}
+
+    @property
+    def books(self) -> tuple[str, ...]:
+        return self.canon.books
+
+    @property
+    def chapter_counts(self) -> Mapping[str, int]:
+        return self.canon.chapter_counts
+
+    @property
+    def first_chapter_ids(self) -> Mapping[str, int]:
+        return self.canon.first_chapter_ids
 
+    def get_reading_id(self, reading: str) -> int:
+        try:
+            return self.reading_ids[reading]
+        except KeyError:
+            raise ValueError(
+                f"The specified reading ('{reading}') doesn't contain a Bible book and chapter in the expected format."
+            ) from None
 
+    def get_book(self, chapter_id: int) -> str:
+        return self.books[self.book_ordinals[chapter_id]]
+
+
+@dataclass
+class MonthWithStartDay:
+    month_name: str
+    day: int
+
+
+@dataclass
 class BookGroup:
+    """A group's name and the books (in the canon) whose chapters it reads one a day, in turn"""
 
-    # Set by constructor
     group_name: str
     book_list: list[str]
-    reading_index: int
 
-    readings: list[str]
 
-    def __init__(self, group_name: str, book_list: list[str], reading_index: int = 0):
-        self.group_name = group_name
-        self.book_list = book_list
-        self.reading_index = reading_index
+@dataclass(frozen=True)
+class GroupSpec:
+    """A group's name and books, along with its cycle of chapter ids"""
 
-    def set_readings(self, chapter_counts: dict[str, str]):
-        self.readings = []
-        for book in self.book_list:
-            for chapter in range(1, int(chapter_counts[book]) + 1):
-                self.readings.append(f"{book} {chapter}")
+    group_name: str
+    book_list: tuple[str, ...]
+    chapter_ids: tuple[int, ...]
 
-    def increment_reading_index(self):
-        if self.reading_index < len(self.readings) - 1:
-            self.reading_index += 1
-        else:
-            self.reading_index = 0
+
+@dataclass(frozen=True)
+class PlanPosition:
+    """Each of a plan spec's groups' (0-based) position in its cycle, in the spec's order, on a day of the plan"""
+
+    date: datetime.date
+    reading_indexes: tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class PlanSpec:
+    """The plan's groups and their cycles, which never change once made
+
+    A spec holds no position (that's carried by a PlanPosition instead), so it's hashable and can be cached, memoized
+    on and shared between threads, and generating from it never moves it on.
+    """
+
+    groups: tuple[GroupSpec, ...]
+
+    @property
+    def group_names(self) -> list[str]:
+        return [group.group_name for group in self.groups]
+
+    @functools.cached_property
+    def cycle_arrays(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Returns all the groups' cycles laid end to end, along with each cycle's length and start in them"""
+
+        cycles = np.array([chapter_id for group in self.groups for chapter_id in group.chapter_ids], dtype=np.uint16)
+        cycle_lengths = np.array([len(group.chapter_ids) for group in self.groups])
+        cycle_starts = np.cumsum(cycle_lengths) - cycle_lengths
+        # They're cached, and shared by every caller (and thread), so none of them can be changed
+        for cycle_array in (cycles, cycle_lengths, cycle_starts):
+            cycle_array.flags.writeable = False
+        return cycles, cycle_lengths, cycle_starts
+
+    def get_position(self, date: datetime.date, reading_indexes: dict[str, int] | None = None) -> PlanPosition:
+        """Returns the position on date at which each named group is at its (0-based) reading index, and every other
+        group is at its first chapter"""
+
+        reading_indexes = reading_indexes or {}
+        unknown_group_names = set(reading_indexes) - set(self.group_names)
+        if unknown_group_names:
+            raise ValueError(f"There are positions for unknown groups: {', '.join(sorted(unknown_group_names))}")
+        return PlanPosition(
+            date,
+            tuple(reading_indexes.get(group.group_name, 0) % len(group.chapter_ids) for group in self.groups),
+        )
+
+    def get_reading_indexes(self, plan_position: PlanPosition) -> dict[str, int]:
+        """Returns each group's position, by group name, as get_position() takes them"""
+        return dict(zip(self.group_names, plan_position.reading_indexes))
+
+    def move(self, plan_position: PlanPosition, date: datetime.date) -> PlanPosition:
+        """Returns the groups' positions on date, given their positions on another day"""
+
+        days_elapsed = (date - plan_position.date).days
+        return PlanPosition(
+            date,
+            tuple(
+                (reading_index + days_elapsed) % len(group.chapter_ids)
+                for group, reading_index in zip(self.groups, plan_position.reading_indexes)
+            ),
+        )
+
+    def get_plan_matrix(
+        self, plan_position: PlanPosition, start_date: datetime.date, end_date: datetime.date
+    ) -> np.ndarray:
+        """Returns the plan from start_date thru end_date as a days x groups matrix of chapter ids"""
+
+        # All the groups' cycles laid end to end, so that one fancy-indexing operation gathers every reading
+        cycles, cycle_lengths, cycle_starts = self.cycle_arrays
+        offsets = np.array(self.move(plan_position, start_date).reading_indexes)
+        days = np.arange((end_date - start_date).days + 1)[:, None]
+        return cycles[(days + offsets) % cycle_lengths + cycle_starts]
+
+
+def get_plan_spec(book_groups: list[BookGroup], chapter_index: ChapterIndex) -> PlanSpec:
+    group_specs: list[GroupSpec] = []
+    for book_group in book_groups:
+        chapter_ids: list[int] = []
+        for book in book_group.book_list:
+            first_chapter_id = chapter_index.first_chapter_ids[book]
+            chapter_ids.extend(range(first_chapter_id, first_chapter_id + chapter_index.chapter_counts[book]))
+        group_specs.append(GroupSpec(book_group.group_name, tuple(book_group.book_list), tuple(chapter_ids)))
+
+    return PlanSpec(tuple(group_specs))
 
 
 def get_plan_readings(
     start_date: datetime.date,
     end_date: datetime.date,
-    chapter_counts: dict[str, str],
-    book_groups: list[BookGroup],
+    chapter_index: ChapterIndex,
+    plan_spec: PlanSpec,
+    plan_position: PlanPosition,
 ) -> list[dict[str, str]]:
+    plan_matrix = plan_spec.get_plan_matrix(plan_position, start_date, end_date)
 
-    print("\nGroup names, each with its number of distinct readings")
-    for book_group in book_groups:
-        book_group.set_readings(chapter_counts)
-        print(f"\t{book_group.group_name}: {len(book_group.readings)}")
-
+    readings = chapter_index.readings
+    group_names = plan_spec.group_names
     plan_readings_raw = []
-    number_of_days_in_plan = (end_date - start_date).days + 1
     date: datetime.date = start_date
-    for day in range(number_of_days_in_plan):
+    for days_chapter_ids in plan_matrix.tolist():
         days_readings: dict[str, str] = {"Date": str(date)}
-        for book_group in book_groups:
-            days_readings[book_group.group_name] = book_group.readings[book_group.reading_index]
-            book_group.increment_reading_index()
+        for group_name, chapter_id in zip(group_names, days_chapter_ids):
+            days_readings[group_name] = readings[chapter_id]
         date += datetime.timedelta(days=1)
         plan_readings_raw.append(days_readings)
 
     return plan_readings_raw
 
 
-def get_formatted_date(date: datetime.date) -> str:
-    day_of_week = str(date.strftime("%a"))
-    day_of_week = "L.D." if (day_of_week == "Sun") else day_of_week
-    return (
-        f"{day_of_week} {str(date.strftime('%m/%e')).removeprefix('0').replace(' ', '')}"  # Remove/replace 0-padding
+def get_readings_for_date(
+    date: datetime.date,
+    chapter_index: ChapterIndex,
+    plan_spec: PlanSpec,
+    plan_position: PlanPosition,
+) -> dict[str, str]:
+    """Returns the same readings for date that get_plan_readings() would, without stepping through the prior days"""
+
+    days_readings: dict[str, str] = {"Date": str(date)}
+    for group, reading_index in zip(plan_spec.groups, plan_spec.move(plan_position, date).reading_indexes):
+        days_readings[group.group_name] = chapter_index.readings[group.chapter_ids[reading_index]]
+
+    return days_readings
+
+
+def iter_plan_chapter_ids(
+    start_date: datetime.date,
+    end_date: datetime.date,
+    plan_spec: PlanSpec,
+    plan_position: PlanPosition,
+    days_per_chunk: int = 366,
+) -> Iterator[tuple[datetime.date, list[int]]]:
+    """Lazily yields each day's date and chapter ids, only ever holding days_per_chunk days of the plan in memory"""
+
+    chunk_start_date = start_date
+    while chunk_start_date <= end_date:
+        chunk_end_date = min(end_date, chunk_start_date + datetime.timedelta(days=days_per_chunk - 1))
+        plan_matrix = plan_spec.get_plan_matrix(plan_position, chunk_start_date, chunk_end_date)
+        date = chunk_start_date
+        for days_chapter_ids in plan_matrix.tolist():
+            yield date, days_chapter_ids
+            date += datetime.timedelta(days=1)
+        chunk_start_date = date
+
+
+def read_plan_position(filename: str | Path, plan_spec: PlanSpec) -> PlanPosition:
+    """Reads a JSON file with a date and each group's (0-based) position on it, by group name (any group it doesn't
+    mention being at 0)"""
+
+    plan_position = json.loads(Path(filename).read_text(encoding="utf-8"))
+    return plan_spec.get_position(
+        datetime.date.fromisoformat(plan_position["date"]), plan_position["reading_indexes"]
     )
 
 
-def get_formatted_reading(reading: str, abbreviations: dict[str, str], chapter_counts: dict[str, str]) -> str:
-    pattern = re.compile(r"(.*) (\d+$)")
-    matches = pattern.match(reading)
-    if matches:
-        book = matches.group(1)
-        chapter = matches.group(2)
-        if chapter_counts[book] == "1":  # if reading is for a 1-chapter book
-            return book.replace(
-                " ", ""
-            )  # then replace the reading with just the unabbreviated book name (without blank spaces)
-            # "2 John" -> "2John" and "3 John" -> "3John"
-        else:
-            return f"{abbreviations[book]} {chapter}"
-    else:
-        raise ValueError(
-            f"The specified reading ('{reading}') doesn't contain a Bible book and chapter in the expected format."
+def write_plan_position(plan_position: PlanPosition, plan_spec: PlanSpec, filename: str | Path):
+    Path(filename).write_text(
+        json.dumps(
+            {"date": str(plan_position.date), "reading_indexes": plan_spec.get_reading_indexes(plan_position)},
+            indent=4,
         )
+        + "\n",
+        encoding="utf-8",
+    )
+
+
+def get_date_range(start_date: datetime.date, end_date: datetime.date) -> str:
+    return f"{start_date.strftime('%Y%m%d')}-{end_date.strftime('%Y%m%d')}"
+
+
+def get_months_with_start_days(start_date: datetime.date, end_date: datetime.date) -> list[MonthWithStartDay]:
+    """Returns each month in the plan, with the (0-based) day of the plan on which that month's readings start"""
+
+    months_with_start_days: list[MonthWithStartDay] = []
+    day = 0
+    date = start_date
+    while date <= end_date:
+        months_with_start_days.append(MonthWithStartDay(date.strftime("%B %Y"), day))
+        days_in_month = calendar.monthrange(date.year, date.month)[1]
+        day += days_in_month - date.day + 1
+        date = start_date + datetime.timedelta(days=day)
+
+    return months_with_start_days
+
+
+def get_formatted_full_date(date: datetime.date) -> str:
+    return f"{date.month}/{date.day}/{date.year}"
+
+
+@functools.cache
+def get_date_label(day_of_week: int, month: int, day: int) -> str:
+    """Returns a formatted date like "L.D. 1/1" or "Mon 1/2", built just once for each possible combination"""
+
+    day_of_week_label = "L.D." if (day_of_week == calendar.SUNDAY) else calendar.day_abbr[day_of_week]
+    return f"{day_of_week_label} {month}/{day}"
+
+
+def get_formatted_date(date: datetime.date) -> str:
+    return get_date_label(date.weekday(), date.month, date.day)
+
+
+def get_formatted_reading(chapter_id: int, abbreviations: dict[str, str], chapter_index: ChapterIndex) -> str:
+    book = chapter_index.get_book(chapter_id)
+    if chapter_index.chapter_counts[book] == 1:  # if reading is for a 1-chapter book
+        return book.replace(
+            " ", ""
+        )  # then replace the reading with just the unabbreviated book name (without blank spaces)
+        # "2 John" -> "2John" and "3 John" -> "3John"
+    else:
+        return f"{abbreviations[book]} {chapter_index.chapters[chapter_id]}"
+
+
+def get_reading_labels(abbreviations: dict[str, str], chapter_index: ChapterIndex) -> list[str]:
+    """Returns the formatted reading for every chapter id, built just once for each set of abbreviations"""
+
+    abbreviations_key = tuple(abbreviations.items())
+    if abbreviations_key not in chapter_index.reading_labels:
+        chapter_index.reading_labels[abbreviations_key] = [
+            get_formatted_reading(chapter_id, abbreviations, chapter_index)
+            for chapter_id in range(len(chapter_index.readings))
+        ]
+    return chapter_index.reading_labels[abbreviations_key]
 
 
 def get_plan_readings_formatted(
     plan_readings_raw: list[dict[str, str]],
     abbreviations: dict[str, str],
-    chapter_counts: dict[str, str],
+    chapter_index: ChapterIndex,
 ) -> list[dict[str, str]]:
 
     plan_readings_formatted: list[dict[str, str]] = []
 
+    reading_labels = get_reading_labels(abbreviations, chapter_index)
     for days_readings in plan_readings_raw:
         days_readings_formatted: dict[str, str] = {}
         for key, value in days_readings.items():
             if key == "Date":
-                date = datetime.date(int(value[0:4]), int(value[5:7]), int(value[8:10]))
-                days_readings_formatted[key] = get_formatted_date(date)
+                days_readings_formatted[key] = get_formatted_date(datetime.date.fromisoformat(value))
             else:
-                days_readings_formatted[key] = f"{get_formatted_reading(value, abbreviations, chapter_counts)}"
+                days_readings_formatted[key] = reading_labels[chapter_index.get_reading_id(value)]
         plan_readings_formatted.append(days_readings_formatted)
 
     return plan_readings_formatted
 
 
+def get_days_readings_raw(date: datetime.date, chapter_ids: list[int], chapter_index: ChapterIndex) -> list[str]:
+    return [str(date)] + [chapter_index.readings[chapter_id] for chapter_id in chapter_ids]
+
+
+def get_days_readings_formatted(date: datetime.date, chapter_ids: list[int], reading_labels: list[str]) -> list[str]:
+    """Returns the day's formatted date and readings, given the reading labels from get_reading_labels()"""
+
+    return [get_formatted_date(date)] + [reading_labels[chapter_id] for chapter_id in chapter_ids]
+
+
 def write_readings_to_csv(plan_readings: list[dict[str, str]], csv_file_prefix: str, date_range: str):
     column_headings = ",".join(plan_readings[0].keys())
     with open(f"{csv_file_prefix}-{date_range}.csv", "w", encoding="utf-8") as csv_file:
@@ -117,165 +373,590 @@ def write_readings_to_csv(plan_readings: list[dict[str, str]], csv_file_prefix:
             csv_file.write(f"{column_data}\n")
 
 
-def write_readings_to_html(plan_readings: list[dict[str, str]], csv_file_prefix: str, date_range: str):
-
-    # Adapted from https://www.pythonforbeginners.com/basics/convert-csv-to-html-table-in-python
-    # and https://www.geeksforgeeks.org/convert-csv-to-html-table-in-python/
-
-    with open(f"{csv_file_prefix}-{date_range}.csv", "r", encoding="utf-8") as csv_file:
-
-        data = csv_file.readlines()
-        column_names = data[0].split(",")
-        table = PrettyTable(column_names)
-
-        for i in range(1, len(data)):
-            table.add_row(data[i].split(","))
-        html_string = table.get_html_string()
-
-        with open(f"{csv_file_prefix}-{date_range}-table.html", "w", encoding="utf-8") as html_file:
-            html_file.writelines(html_string)
-
-        with open("horner-classic-formatted-template.html", "r", encoding="utf-8") as template_file:
-            template_string = template_file.read()
-        text_template = string.Template(template_string)
-
-        # TODO: The code below is hard-coded to work only for a plan lasting from Jan. 1 thru Dec. 31 2023
-        #   Make it work instead in the general case
-
-        heading_and_table1 = f"    <h3>Horner Classic Bible Reading Plan - January 2023 </h3>\n{table[0:31].get_html_string()}"
-        heading_and_table2 = f"    <h3>Horner Classic Bible Reading Plan - February 2023 </h3>\n{table[31:59].get_html_string()}"
-        heading_and_table3 = f"    <h3>Horner Classic Bible Reading Plan - March 2023 </h3>\n{table[59:90].get_html_string()}"
-        heading_and_table4 = f"    <h3>Horner Classic Bible Reading Plan - April 2023 </h3>\n{table[90:120].get_html_string()}"
-        heading_and_table5 = f"    <h3>Horner Classic Bible Reading Plan - May 2023 </h3>\n{table[120:151].get_html_string()}"
-        heading_and_table6 = f"    <h3>Horner Classic Bible Reading Plan - June 2023 </h3>\n{table[151:181].get_html_string()}"
-        heading_and_table7 = f"    <h3>Horner Classic Bible Reading Plan - July 2023 </h3>\n{table[181:212].get_html_string()}"
-        heading_and_table8 = f"    <h3>Horner Classic Bible Reading Plan - August 2023 </h3>\n{table[212:243].get_html_string()}"
-        heading_and_table9 = f"    <h3>Horner Classic Bible Reading Plan - September 2023 </h3>\n{table[243:273].get_html_string()}"
-        heading_and_table10 = f"    <h3>Horner Classic Bible Reading Plan - October 2023 </h3>\n{table[273:304].get_html_string()}"
-        heading_and_table11 = f"    <h3>Horner Classic Bible Reading Plan - November 2023 </h3>\n{table[304:334].get_html_string()}"
-        heading_and_table12 = f"    <h3>Horner Classic Bible Reading Plan - December 2023 </h3>\n{table[334:365].get_html_string()}"
-
-        readings = text_template.substitute(
-            heading_and_table1=heading_and_table1,
-            heading_and_table2=heading_and_table2,
-            heading_and_table3=heading_and_table3,
-            heading_and_table4=heading_and_table4,
-            heading_and_table5=heading_and_table5,
-            heading_and_table6=heading_and_table6,
-            heading_and_table7=heading_and_table7,
-            heading_and_table8=heading_and_table8,
-            heading_and_table9=heading_and_table9,
-            heading_and_table10=heading_and_table10,
-            heading_and_table11=heading_and_table11,
-            heading_and_table12=heading_and_table12,
+def get_month_heading(month_name: str) -> str:
+    return f"    <h3>Horner Classic Bible Reading Plan - {month_name} </h3>\n"
+
+
+def get_html_template_fragments(start_date: datetime.date, end_date: datetime.date) -> tuple[str, str]:
+    """Returns the parts of the HTML template before and after its month headings and tables"""
+
+    return get_template_fragments(
+        HTML_TEMPLATE_FILENAME,
+        "headings_and_tables",
+        plan_dates=f"{get_formatted_full_date(start_date)} to {get_formatted_full_date(end_date)}",
+    )
+
+
+def write_readings_to_html(
+    plan_readings: list[dict[str, str]],
+    csv_file_prefix: str,
+    start_date: datetime.date,
+    end_date: datetime.date,
+):
+    date_range = get_date_range(start_date, end_date)
+    column_names = list(plan_readings[0].keys())
+    rows = [list(days_readings.values()) for days_readings in plan_readings]
+
+    with open(f"{csv_file_prefix}-{date_range}-table.html", "w", encoding="utf-8") as html_file:
+        write_html_table(html_file, column_names, rows)
+
+    html_file_start, html_file_end = get_html_template_fragments(start_date, end_date)
+    months_with_start_days = get_months_with_start_days(start_date, end_date)
+    with open(f"{csv_file_prefix}-{date_range}.html", "w", encoding="utf-8") as html_file:
+        html_file.write(html_file_start)
+        for index, month_with_start_day in enumerate(months_with_start_days):
+            end_day = months_with_start_days[index + 1].day if index + 1 < len(months_with_start_days) else len(rows)
+            if index:
+                html_file.write("\n")
+            html_file.write(get_month_heading(month_with_start_day.month_name))
+            write_html_table(
+                html_file, column_names, rows[month_with_start_day.day : end_day], MONTH_TABLE_ATTRIBUTES
+            )
+        html_file.write(html_file_end)
+
+
+class ReadingsCsvSink:
+    """Writes each day's readings to a CSV file as they're produced by write_plan()"""
+
+    name: str
+    csv_file: TextIO
+    get_days_readings: Callable[[datetime.date, list[int]], list[str]]
+    bytes_written: int
+
+    def __init__(
+        self,
+        filename: str,
+        column_names: list[str],
+        get_days_readings: Callable[[datetime.date, list[int]], list[str]],
+    ):
+        self.name = Path(filename).name
+        self.csv_file = open(filename, "w", encoding="utf-8")
+        self.csv_file.write(f"{','.join(column_names)}\n")
+        self.get_days_readings = get_days_readings
+        self.bytes_written = 0
+
+    def write(self, date: datetime.date, chapter_ids: list[int]):
+        self.csv_file.write(f"{','.join(self.get_days_readings(date, chapter_ids))}\n")
+
+    def close(self):
+        self.bytes_written = self.csv_file.tell()
+        self.csv_file.close()
+
+    def abort(self):
+        self.csv_file.close()
+        Path(self.csv_file.name).unlink(missing_ok=True)
+
+
+class ReadingsHtmlSink:
+    """Writes each day's readings to the HTML files (with a table per month, and with one big table) as they're produced
+    by write_plan()"""
+
+    name: str
+    html_file: TextIO
+    table_html_file: TextIO
+    html_file_end: str
+    month_table_start: str
+    month_names: dict[int, str]  # The plan day on which each month starts
+    day: int
+    get_days_readings: Callable[[datetime.date, list[int]], list[str]]
+    bytes_written: int
+
+    def __init__(
+        self,
+        csv_file_prefix: str,
+        start_date: datetime.date,
+        end_date: datetime.date,
+        column_names: list[str],
+        get_days_readings: Callable[[datetime.date, list[int]], list[str]],
+    ):
+        date_range = get_date_range(start_date, end_date)
+        self.table_html_file = open(f"{csv_file_prefix}-{date_range}-table.html", "w", encoding="utf-8")
+        self.table_html_file.write(get_html_table_start(column_names))
+
+        html_file_start, self.html_file_end = get_html_template_fragments(start_date, end_date)
+        self.html_file = open(f"{csv_file_prefix}-{date_range}.html", "w", encoding="utf-8")
+        self.name = Path(self.html_file.name).name
+        self.html_file.write(html_file_start)
+        self.month_table_start = get_html_table_start(column_names, MONTH_TABLE_ATTRIBUTES)
+        self.month_names = {
+            month_with_start_day.day: month_with_start_day.month_name
+            for month_with_start_day in get_months_with_start_days(start_date, end_date)
+        }
+
+        self.day = 0
+        self.get_days_readings = get_days_readings
+        self.bytes_written = 0
+
+    def write(self, date: datetime.date, chapter_ids: list[int]):
+        if self.day in self.month_names:
+            if self.day:
+                self.html_file.write(f"{HTML_TABLE_END}\n")
+            self.html_file.write(f"{get_month_heading(self.month_names[self.day])}{self.month_table_start}")
+        html_table_row = get_html_table_row(self.get_days_readings(date, chapter_ids))
+        self.html_file.write(html_table_row)
+        self.table_html_file.write(html_table_row)
+        self.day += 1
+
+    def close(self):
+        self.table_html_file.write(HTML_TABLE_END)
+        self.bytes_written = self.table_html_file.tell()
+        self.table_html_file.close()
+        if self.day:
+            self.html_file.write(HTML_TABLE_END)
+        self.html_file.write(self.html_file_end)
+        self.bytes_written += self.html_file.tell()
+        self.html_file.close()
+
+    def abort(self):
+        for html_file in (self.table_html_file, self.html_file):
+            html_file.close()
+            Path(html_file.name).unlink(missing_ok=True)
+
+
+class OneBigTableSink:
+    """Writes each day's (unformatted) readings to a single HTML table as they're produced by write_plan()"""
+
+    name: str
+    html_file: TextIO
+    html_file_end: str
+    get_days_readings: Callable[[datetime.date, list[int]], list[str]]
+    bytes_written: int
+
+    def __init__(
+        self,
+        filename: str,
+        start_date: datetime.date,
+        end_date: datetime.date,
+        column_names: list[str],
+        get_days_readings: Callable[[datetime.date, list[int]], list[str]],
+    ):
+        self.name = Path(filename).name
+        page_title = f"Horner Classic Bible Reading Plan for: {start_date} to {end_date}"
+        html_file_start, self.html_file_end = get_template_fragments(
+            ONE_BIG_TABLE_TEMPLATE_FILENAME, "headings_and_tables", page_title=page_title
+        )
+        self.html_file = open(filename, "w", encoding="utf-8")
+        self.html_file.write(f"{html_file_start}<h3>{page_title}</h3>")
+        self.html_file.write(get_html_table_start(column_names, MONTH_TABLE_ATTRIBUTES))
+        self.get_days_readings = get_days_readings
+        self.bytes_written = 0
+
+    def write(self, date: datetime.date, chapter_ids: list[int]):
+        self.html_file.write(get_html_table_row(self.get_days_readings(date, chapter_ids)))
+
+    def close(self):
+        self.html_file.write(f"{HTML_TABLE_END}{self.html_file_end}")
+        self.bytes_written = self.html_file.tell()
+        self.html_file.close()
+
+    def abort(self):
+        self.html_file.close()
+        Path(self.html_file.name).unlink(missing_ok=True)
+
+
+def write_plan(
+    start_date: datetime.date,
+    end_date: datetime.date,
+    plan_spec: PlanSpec,
+    plan_position: PlanPosition,
+    sinks: list,
+):
+    """Generates the plan one day at a time, passing each day to every sink (each with write(), close() and abort()
+    methods)"""
+
+    write_days(iter_plan_chapter_ids(start_date, end_date, plan_spec, plan_position), sinks)
+
+
+def write_days(days: Iterable[tuple[datetime.date, list[int]]], sinks: list):
+    """Passes each day's date and chapter ids to every sink, and then closes the sinks
+
+    If that fails, every sink not yet closed is aborted instead, so that none leaves a truncated output looking
+    complete.
+    """
+
+    sinks_closed = 0
+    try:
+        for date, chapter_ids in days:
+            for sink in sinks:
+                sink.write(date, chapter_ids)
+        for sink in sinks:
+            sink.close()
+            sinks_closed += 1
+    except BaseException:
+        for sink in sinks[sinks_closed:]:
+            sink.abort()
+        raise
+
+
+def get_book_groups() -> list[BookGroup]:
+    return [BookGroup(group_name, list(book_list)) for group_name, book_list in BOOK_GROUPS.items()]
+
+
+@dataclass
+class PlanConfig:
+    """What create_plan.py writes: the plan's dates, groups and each group's position on start_date (by group name),
+    any abbreviations other than those in bible_book_info.csv, and which of OUTPUTS to write"""
+
+    start_date: datetime.date = START_DATE
+    end_date: datetime.date = END_DATE
+    book_groups: list[BookGroup] = field(default_factory=get_book_groups)
+    reading_indexes: dict[str, int] = field(default_factory=dict)
+    abbreviations: dict[str, str] = field(default_factory=dict)
+    outputs: list[str] = field(default_factory=lambda: list(OUTPUTS))
+
+
+def is_list_of_strings(value) -> bool:
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+
+def read_plan_config(filename: str | Path, books: list[str]) -> PlanConfig:
+    """Reads a TOML (or, if its name ends in .json, JSON) plan config, in which every setting is optional
+
+    For example:
+        start_date = 2024-01-01
+        end_date = 2024-12-31
+        outputs = ["formatted_csv", "monthly_html"]
+
+        [abbreviations]
+        "Song of Songs" = "Song"
+
+        [[groups]]
+        name = "Gospels"
+        books = ["Matthew", "Mark", "Luke", "John"]
+        reading_index = 0  # The group's (0-based) position on start_date
+    """
+
+    with open(filename, "rb") as config_file:
+        settings: dict = json.load(config_file) if str(filename).endswith(".json") else tomllib.load(config_file)
+
+    unknown_settings = set(settings) - {"start_date", "end_date", "groups", "abbreviations", "outputs"}
+    if unknown_settings:
+        raise ValueError(f"The plan config has unknown settings: {', '.join(sorted(unknown_settings))}")
+    plan_config = PlanConfig()
+    for setting in ("start_date", "end_date"):
+        if setting in settings:
+            value = settings[setting]
+            if isinstance(value, str):
+                value = datetime.date.fromisoformat(value)
+            if not isinstance(value, datetime.date):
+                raise ValueError(f"The plan config's {setting} ({value!r}) must be a date.")
+            setattr(plan_config, setting, value)
+    if plan_config.end_date < plan_config.start_date:
+        raise ValueError(f"The plan's end_date ({plan_config.end_date}) is before its start_date.")
+
+    if "groups" in settings:
+        if not isinstance(settings["groups"], list) or not all(isinstance(group, dict) for group in settings["groups"]):
+            raise ValueError("The plan config's groups must be a list of tables.")
+        plan_config.book_groups = []
+        for group in settings["groups"]:
+            unknown_group_settings = set(group) - {"name", "books", "reading_index"}
+            if unknown_group_settings:
+                raise ValueError(
+                    f"The plan config's group {group.get('name', '')!r} has unknown settings:"
+                    f" {', '.join(sorted(unknown_group_settings))}"
+                )
+            if not isinstance(group["name"], str):
+                raise ValueError(f"The plan config's group name ({group['name']!r}) must be a string.")
+            if not is_list_of_strings(group["books"]):
+                raise ValueError(f"The books of the plan config's group {group['name']!r} must be a list of strings.")
+            if not group["books"]:
+                raise ValueError(f"The plan config's group {group['name']!r} has no books.")
+            reading_index = group.get("reading_index", 0)
+            # bool is a subclass of int, but true isn't a position
+            if not isinstance(reading_index, int) or isinstance(reading_index, bool):
+                raise ValueError(
+                    f"The reading_index of the plan config's group {group['name']!r} ({reading_index!r}) must be an"
+                    " integer."
+                )
+            plan_config.book_groups.append(BookGroup(group["name"], group["books"]))
+            plan_config.reading_indexes[group["name"]] = reading_index
+        group_names = [book_group.group_name for book_group in plan_config.book_groups]
+        duplicate_group_names = {group_name for group_name in group_names if group_names.count(group_name) > 1}
+        if duplicate_group_names:
+            raise ValueError(
+                f"The plan config has more than one group named: {', '.join(sorted(duplicate_group_names))}"
+            )
+    abbreviations = settings.get("abbreviations", {})
+    if not isinstance(abbreviations, dict) or not all(
+        isinstance(abbreviation, str) for abbreviation in abbreviations.values()
+    ):
+        raise ValueError("The plan config's abbreviations must each be a string.")
+    unknown_books = {
+        book for book_group in plan_config.book_groups for book in book_group.book_list if book not in books
+    } | (set(abbreviations) - set(books))
+    if unknown_books:
+        raise ValueError(f"The plan config names unknown books: {', '.join(sorted(unknown_books))}")
+    plan_config.abbreviations = abbreviations
+
+    plan_config.outputs = settings.get("outputs", plan_config.outputs)
+    if not is_list_of_strings(plan_config.outputs):
+        raise ValueError("The plan config's outputs must be a list of strings.")
+    unknown_outputs = set(plan_config.outputs) - set(OUTPUTS)
+    if unknown_outputs:
+        raise ValueError(
+            f"The plan config has unknown outputs: {', '.join(sorted(unknown_outputs))}"
+            f" (they must be from: {', '.join(OUTPUTS)})"
+        )
+
+    return plan_config
+
+
+def get_plan_inputs_hash(plan_spec: PlanSpec, plan_position: PlanPosition) -> str:
+    """Returns a hash of everything, other than the day itself, that determines each day's readings"""
+
+    return get_hash(
+        repr(get_canon().book_info),
+        str(plan_position.date),
+        *[
+            f"{group.group_name}:{','.join(group.book_list)}:{reading_index}"
+            for group, reading_index in zip(plan_spec.groups, plan_position.reading_indexes)
+        ],
+    )
+
+
+def get_readings_output_jobs(
+    output_folder: Path,
+    start_date: datetime.date,
+    end_date: datetime.date,
+    plan_spec: PlanSpec,
+    plan_position: PlanPosition,
+    abbreviations: dict[str, str],
+    chapter_index: ChapterIndex,
+    manifest: BuildManifest | None = None,
+    outputs: list[str] = READINGS_OUTPUTS,
+) -> list[OutputJob]:
+    """Returns the jobs for those of the plan's CSV, HTML, plan file and database outputs (see OUTPUTS) in outputs,
+    all written to output_folder, the HTML ones each to be written in a process of its own
+
+    With a manifest, files already written from the same inputs are left alone, and get no job.
+    """
+
+    date_range: str = get_date_range(start_date, end_date)
+    column_names: list[str] = ["Date"] + plan_spec.group_names
+    get_days_readings_raw_for_plan = functools.partial(get_days_readings_raw, chapter_index=chapter_index)
+    get_days_readings_formatted_for_plan = functools.partial(
+        get_days_readings_formatted, reading_labels=get_reading_labels(abbreviations, chapter_index)
+    )
+
+    plan_inputs_hash = (
+        get_hash(get_plan_inputs_hash(plan_spec, plan_position), json.dumps(abbreviations, sort_keys=True))
+        if manifest
+        else ""
+    )
+
+    def needs_writing(filenames: list[Path], template_filenames: list[str]) -> bool:
+        if not manifest:
+            return True
+        input_hash = get_hash(plan_inputs_hash, date_range, *map(get_file_hash, template_filenames))
+        if manifest.is_up_to_date(filenames, input_hash):
+            return False
+        manifest.record(filenames, input_hash)
+        return True
+
+    output_jobs: list[OutputJob] = []
+    raw_csv_filename = output_folder / f"horner_classic-{date_range}.csv"
+    if "raw_csv" in outputs and needs_writing([raw_csv_filename], []):
+        output_jobs.append(
+            OutputJob(
+                raw_csv_filename.name,
+                functools.partial(
+                    ReadingsCsvSink, str(raw_csv_filename), column_names, get_days_readings_raw_for_plan
+                ),
+            )
+        )
+    formatted_csv_filename = output_folder / f"horner-classic-formatted-{date_range}.csv"
+    if "formatted_csv" in outputs and needs_writing([formatted_csv_filename], []):
+        output_jobs.append(
+            OutputJob(
+                formatted_csv_filename.name,
+                functools.partial(
+                    ReadingsCsvSink, str(formatted_csv_filename), column_names, get_days_readings_formatted_for_plan
+                ),
+            )
+        )
+    html_file_prefix = output_folder / "horner-classic-formatted"
+    html_filenames = [Path(f"{html_file_prefix}-{date_range}{suffix}") for suffix in (".html", "-table.html")]
+    if "monthly_html" in outputs and needs_writing(html_filenames, [HTML_TEMPLATE_FILENAME]):
+        output_jobs.append(
+            OutputJob(
+                html_filenames[0].name,
+                functools.partial(
+                    ReadingsHtmlSink,
+                    str(html_file_prefix),
+                    start_date,
+                    end_date,
+                    column_names,
+                    get_days_readings_formatted_for_plan,
+                ),
+                in_process=True,
+            )
+        )
+    # Named for the plan's dates only in its page title, so the date range is part of its inputs' hash
+    one_big_table_filename = output_folder / ONE_BIG_TABLE_FILENAME
+    if "one_big_table_html" in outputs and needs_writing([one_big_table_filename], [ONE_BIG_TABLE_TEMPLATE_FILENAME]):
+        output_jobs.append(
+            OutputJob(
+                one_big_table_filename.name,
+                functools.partial(
+                    OneBigTableSink,
+                    str(one_big_table_filename),
+                    start_date,
+                    end_date,
+                    column_names,
+                    get_days_readings_raw_for_plan,
+                ),
+                in_process=True,
+            )
         )
-        readings = readings.replace('<table>', '<table role="presentation">')
-        with open("horner-classic-formatted-20230101-20231231.html", "w", encoding="utf-8") as html_file:
-            html_file.writelines(readings)
+
+    plan_filename = output_folder / f"horner_classic-{date_range}.plan"
+    if "plan_file" in outputs and needs_writing([plan_filename], []):
+        output_jobs.append(
+            OutputJob(
+                plan_filename.name,
+                functools.partial(PlanFileSink, plan_filename, start_date, end_date, column_names[1:]),
+            )
+        )
+    database_filename = output_folder / f"horner_classic-{date_range}.sqlite"
+    if "sqlite" in outputs and needs_writing([database_filename], []):
+        output_jobs.append(
+            OutputJob(
+                database_filename.name,
+                functools.partial(PlanDatabaseSink, database_filename, column_names[1:], chapter_index.canon),
+            )
+        )
+
+    return output_jobs
+
+
+def get_readings_sinks(
+    output_folder: Path,
+    start_date: datetime.date,
+    end_date: datetime.date,
+    plan_spec: PlanSpec,
+    plan_position: PlanPosition,
+    abbreviations: dict[str, str],
+    chapter_index: ChapterIndex,
+    manifest: BuildManifest | None = None,
+    outputs: list[str] = READINGS_OUTPUTS,
+) -> list:
+    """Returns the sinks for the jobs from get_readings_output_jobs(), for writing the plan in a single pass"""
+
+    output_jobs = get_readings_output_jobs(
+        output_folder, start_date, end_date, plan_spec, plan_position, abbreviations, chapter_index, manifest, outputs
+    )
+    return [output_job.make_sink() for output_job in output_jobs]
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const=PROFILE_REPORT_FILENAME,
+        help="write each stage's times, peak memory and output sizes to a JSON file (by default, %(const)s)",
+    )
+    parser.add_argument("--cprofile-folder", type=Path, help="with --profile, also dump a cProfile of each stage here")
 
 
 def main():
 
-    book_groups: list[BookGroup] = [
-        BookGroup("Gospels", ["Matthew", "Mark", "Luke", "John"]),
-        BookGroup("Pentateuch", ["Genesis", "Exodus", "Leviticus", "Numbers", "Deuteronomy"]),
-        BookGroup(
-            "Epistles1",
-            [
-                "Romans",
-                "1 Corinthians",
-                "2 Corinthians",
-                "Galatians",
-                "Ephesians",
-                "Philippians",
-                "Colossians",
-                "Hebrews",
-            ],
-        ),
-        BookGroup(
-            "Epistles2",
-            [
-                "1 Thessalonians",
-                "2 Thessalonians",
-                "1 Timothy",
-                "2 Timothy",
-                "Titus",
-                "Philemon",
-                "James",
-                "1 Peter",
-                "2 Peter",
-                "1 John",
-                "2 John",
-                "3 John",
-                "Jude",
-                "Revelation",
-            ],
-        ),
-        BookGroup("Wisdom", ["Job", "Ecclesiastes", "Song of Songs"]),
-        BookGroup("Psalms", ["Psalms"]),
-        BookGroup("Proverbs", ["Proverbs"]),
-        BookGroup(
-            "History",
-            [
-                "Joshua",
-                "Judges",
-                "Ruth",
-                "1 Samuel",
-                "2 Samuel",
-                "1 Kings",
-                "2 Kings",
-                "1 Chronicles",
-                "2 Chronicles",
-                "Ezra",
-                "Nehemiah",
-                "Esther",
-            ],
-        ),
-        BookGroup(
-            "Prophets",
-            [
-                "Isaiah",
-                "Jeremiah",
-                "Lamentations",
-                "Ezekiel",
-                "Daniel",
-                "Hosea",
-                "Joel",
-                "Amos",
-                "Obadiah",
-                "Jonah",
-                "Micah",
-                "Nahum",
-                "Habakkuk",
-                "Zephaniah",
-                "Haggai",
-                "Zechariah",
-                "Malachi",
-            ],
-        ),
-        BookGroup("Acts", ["Acts"]),
-    ]
-
-    abbreviations: dict[str, str] = {}
-    chapter_counts: dict[str, str] = {}
-    with open("bible_book_info.csv", "r", encoding="utf-8") as csv_file:
-        reader = csv.DictReader(csv_file)
-        for row in reader:
-            abbreviations[row["book"]] = row["abbreviation"]
-            chapter_counts[row["book"]] = row["chapters"]
-
-    start_date = datetime.date(2023, 1, 1)
-    end_date = datetime.date(2023, 12, 31)
-    date_range: str = f"{start_date.strftime('%Y%m%d')}-{end_date.strftime('%Y%m%d')}"
-
-    plan_readings_raw: list[dict[str, str]] = get_plan_readings(start_date, end_date, chapter_counts, book_groups)
-    write_readings_to_csv(plan_readings_raw, "horner_classic", date_range)
-
-    plan_readings_formatted: list[dict[str, str]] = get_plan_readings_formatted(
-        plan_readings_raw, abbreviations, chapter_counts
+    # Imported here, rather than at the top, since create_playlists itself imports this module
+    from create_playlists import PlaylistSink
+
+    parser = argparse.ArgumentParser(description="Create the plan's CSV, HTML and playlist files")
+    parser.add_argument(
+        "--config",
+        help="TOML (or JSON) file setting the plan's dates, groups, abbreviations and outputs (see read_plan_config())",
+    )
+    parser.add_argument("--force", action="store_true", help="rewrite every file, even if its inputs haven't changed")
+    parser.add_argument(
+        "--cursor",
+        help="JSON file with each group's position on the plan's first day (which overrides the start date), if it"
+        " exists; rewritten with each group's position on the day after the plan's last day",
+    )
+    parser.add_argument("--end-date", type=datetime.date.fromisoformat, help="the plan's last day")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    profiler = StageProfiler(args.profile is not None, args.cprofile_folder)
+    with profiler.stage("loading book info"):
+        canon = get_canon()
+        chapter_index = ChapterIndex(canon)
+        try:
+            plan_config = read_plan_config(args.config, chapter_index.books) if args.config else PlanConfig()
+        except (OSError, ValueError, KeyError, tomllib.TOMLDecodeError) as error:
+            parser.error(f"The plan config ({args.config}) can't be used: {error}")
+        abbreviations = {**canon.abbreviations, **plan_config.abbreviations}
+
+    with profiler.stage("building group readings"):
+        plan_spec = get_plan_spec(plan_config.book_groups, chapter_index)
+        print("\nGroup names, each with its number of distinct readings")
+        for group in plan_spec.groups:
+            print(f"\t{group.group_name}: {len(group.chapter_ids)}")
+
+    start_date, end_date = plan_config.start_date, args.end_date or plan_config.end_date
+    try:
+        if args.cursor and Path(args.cursor).exists():
+            plan_position = read_plan_position(args.cursor, plan_spec)
+            start_date = plan_position.date
+        else:
+            plan_position = plan_spec.get_position(start_date, plan_config.reading_indexes)
+    except (OSError, ValueError, KeyError) as error:
+        parser.error(f"The cursor ({args.cursor}) can't be used: {error}")
+    if end_date < start_date:
+        parser.error(f"The plan's last day ({end_date}) is before its first day ({start_date}).")
+
+    manifest = BuildManifest(force=args.force)
+    output_jobs = get_readings_output_jobs(
+        Path("."),
+        start_date,
+        end_date,
+        plan_spec,
+        plan_position,
+        abbreviations,
+        chapter_index,
+        manifest,
+        plan_config.outputs,
     )
-    write_readings_to_csv(plan_readings_formatted, "horner-classic-formatted", date_range)
-    write_readings_to_html(plan_readings_formatted, "horner-classic-formatted", date_range)
+    # The playlist sink is made by its job, like every other output's, so that failing to make it is reported along
+    # with the rest; it's kept to report how many playlists it wrote
+    playlist_sinks: list[PlaylistSink] = []
+    if "playlists" in plan_config.outputs:
+        plan_inputs_hash = get_plan_inputs_hash(plan_spec, plan_position)
+
+        def make_playlist_sink() -> PlaylistSink:
+            playlist_sinks.append(PlaylistSink(chapter_index, manifest=manifest, plan_inputs_hash=plan_inputs_hash))
+            return playlist_sinks[-1]
+
+        output_jobs.append(OutputJob(PlaylistSink.name, make_playlist_sink))
+
+    errors: dict[str, str] = {}
+    if profiler.enabled:
+        # Each output is timed on its own, so they're written one after another, in a single pass over the plan
+        with profiler.stage("opening outputs"):
+            sinks = [output_job.make_sink() for output_job in output_jobs]
+        with profiler.stage("writing plan"):
+            write_plan(start_date, end_date, plan_spec, plan_position, profiler.wrap_sinks(sinks))
+        profiler.add_sink_stages("writing plan")
+        profiler.write_report(args.profile)
+    else:
+        plan_matrix = plan_spec.get_plan_matrix(plan_position, start_date, end_date)
+        errors = write_outputs(start_date, plan_matrix, output_jobs)
+    if errors:
+        # Not saving the manifest, so that every output is rewritten (if need be) next time
+        print("\nThese outputs couldn't be written:")
+        for name, error in errors.items():
+            print(f"\t{name}: {error}")
+        raise SystemExit(1)
+    manifest.save()
+    if args.cursor:
+        write_plan_position(
+            plan_spec.move(plan_position, end_date + datetime.timedelta(days=1)), plan_spec, args.cursor
+        )
+    for playlist_sink in playlist_sinks:
+        print(
+            f"\nWrote {playlist_sink.files_written} playlists ({playlist_sink.files_unchanged} were already up to date)"
+        )
 
 
 if __name__ == "__main__":
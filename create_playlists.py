@@ -1,63 +1,199 @@
-import csv
+import argparse
 import datetime
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 
+from build_manifest import BuildManifest, get_file_hash, get_hash
+from canon import OLD_TESTAMENT, get_canon
+from create_plan import (
+    END_DATE,
+    START_DATE,
+    ChapterIndex,
+    add_profile_arguments,
+    get_book_groups,
+    get_plan_inputs_hash,
+    get_plan_spec,
+    write_days,
+    write_plan,
+)
+from plan_file import PlanFile
+from stage_profiler import StageProfiler
+
 # Although Samsung Music Player (for Android) properly handles relative filepaths, Android VLC player doesn't seem to do so.
 ANDROID_BIBLE_AUDIO_FOLDER = "/storage/emulated/0/Music/BibleAudio/"
 
+# Each target's folder prefix and path separator for the mp3 files
+MP3_PATH_FORMATS: dict[str, tuple[str, str]] = {"windows": ("", "\\"), "android": (ANDROID_BIBLE_AUDIO_FOLDER, "/")}
+TARGETS = list(MP3_PATH_FORMATS)
+
+MAX_PENDING_WRITES = 1024
+
+
+def get_mp3_path_parts(chapter_id: int, chapter_index: ChapterIndex) -> tuple[str, str, str]:
+    """Returns the testament folder, book folder and filename of a chapter's Talking Bible International KJV CD audio
+    file"""
+
+    book: str = chapter_index.get_book(chapter_id)
+    testament: str = chapter_index.canon.testaments[book]
+    book_num: str = str(chapter_index.canon.get_testament_book_number(book)).zfill(2)
+    chapter: str = str(chapter_index.chapters[chapter_id])
+
+    book_for_filename = book.replace("Song of Songs", "songofsolomon").replace(" ", "-").lower()
+    chapter_for_filename = chapter.zfill(3 if testament == OLD_TESTAMENT else 2)
+    return (
+        testament,
+        f"{book_num}_{book_for_filename}",
+        f"{book_num}_{book_for_filename}_{chapter_for_filename}.mp3",
+    )
+
+
+def get_playlist_entries(target: str, chapter_index: ChapterIndex) -> list[str]:
+    """Returns each chapter id's complete playlist entry (its #EXTINF line and its mp3 filepath) for the target"""
+
+    if target not in MP3_PATH_FORMATS:
+        raise ValueError(f"The target ('{target}') must be one of: {', '.join(TARGETS)}")
+    folder_prefix, separator = MP3_PATH_FORMATS[target]
+
+    return [
+        f"#EXTINF:0,{reading}\n{folder_prefix}{separator.join(get_mp3_path_parts(chapter_id, chapter_index))}\n"
+        for chapter_id, reading in enumerate(chapter_index.readings)
+    ]
+
+
+def get_playlist_filename(date: datetime.date) -> str:
+    # Example m3u_filenames: "20230101-LD.m3u", "20230102-mon.m3u"
+    return f"{date.strftime('%Y%m%d-%a').lower().replace('sun', 'LD')}.m3u"
+
 
-def create_playlists(target: str):
-    """Creates .m3u playlists from the plan, for use with Talking Bible International's KJV CD audio files"""
-    book_nums: dict[str, int] = {}
-    with open("bible_book_info.csv", "r", encoding="utf-8") as csv_file:
-        reader = csv.DictReader(csv_file)
-        for book_count, row in enumerate(reader, start=1):
-            book_nums[row["book"]] = book_count
-
-    with open("horner_classic-20230101-20231231.csv", "r", encoding="utf-8") as csv_file:
-        reader = csv.DictReader(csv_file)
-        m3u_folder = Path("m3us") / target
-        m3u_folder.mkdir(exist_ok=True)
-        for row in reader:
-            date = datetime.date(int(row["Date"][:4]), int(row["Date"][5:7]), int(row["Date"][8:10]))
-            # Example m3u_filenames: "20230101-LD.m3u", "20230102-mon.m3u"
-            m3u_filename = m3u_folder / f"{date.strftime('%Y%m%d-%a').lower().replace('sun', 'LD')}.m3u"
-            with open(m3u_filename, "w", encoding="utf-8") as m3u_file:
-
-                m3u_file.write("#EXTM3U\n")
-                m3u_file.write(
-                    f"#PLAYLIST:{date.strftime('%Y-%m-%d %a').replace('Sun', 'Lords Day').replace('Sat', 'Preparation Day')}\n"
-                )
-                m3u_file.write("#EXTALB: KJV Bible\n")
-                m3u_file.write("#EXTART: Talking Bibles International\n")
-                m3u_file.write("#EXTGENRE:Speech\n")
-
-                for grouping, reading in row.items():
-                    if grouping != "Date":
-
-                        book_len = len("Song of Songs") if reading[:13] == "Song of Songs" else reading.find(" ", 2)
-                        book: str = reading[:book_len]
-                        testament: str = "ot" if book_nums[book] < 40 else "nt"
-                        book_num: str = str(book_nums[book] if testament == "ot" else book_nums[book] - 39).zfill(2)
-                        chapter: str = reading[book_len + 1 :]
-
-                        m3u_file.write(f"#EXTINF:0,{book} {chapter}\n")
-
-                        book_for_filename = book.replace("Song of Songs", "songofsolomon").replace(" ", "-").lower()
-                        mp3_filepath = Path(f"{testament}") / f"{book_num}_{book_for_filename}"
-                        chapter_for_filename = chapter.zfill(3 if testament == "ot" else 2)
-                        mp3_filename = mp3_filepath / f"{book_num}_{book_for_filename}_{chapter_for_filename}.mp3"
-
-                        if target == "windows":
-                            m3u_file.write(f"{mp3_filename}\n")
-                        elif target == "android":
-                            mp3_filename = ANDROID_BIBLE_AUDIO_FOLDER + str(mp3_filename).replace("\\", "/")
-                            m3u_file.write(f"{mp3_filename}\n")
+def get_playlist_header(date: datetime.date) -> str:
+    return (
+        "#EXTM3U\n"
+        f"#PLAYLIST:{date.strftime('%Y-%m-%d %a').replace('Sun', 'Lords Day').replace('Sat', 'Preparation Day')}\n"
+        "#EXTALB: KJV Bible\n"
+        "#EXTART: Talking Bibles International\n"
+        "#EXTGENRE:Speech\n"
+    )
+
+
+def write_if_changed(filename: Path, content: bytes) -> bool:
+    """Writes content to the file, unless the file already holds exactly that content, returning whether it wrote"""
+
+    try:
+        if filename.stat().st_size == len(content) and filename.read_bytes() == content:
+            return False
+    except FileNotFoundError:
+        pass
+    filename.write_bytes(content)
+    return True
+
+
+class PlaylistSink:
+    """Writes each day's playlist, for every target, as it's produced by create_plan.write_plan()
+
+    Each playlist is built in memory and written in one call, by a pool of threads. With a manifest (and the hash
+    from create_plan.get_plan_inputs_hash()), playlists already written from the same inputs aren't even built.
+    """
+
+    name = "playlists"
+    targets: list[str]
+    m3u_folders: list[Path]
+    playlist_entries: list[list[str]]  # For each target, indexed by chapter id
+    executor: ThreadPoolExecutor
+    pending_writes: deque[tuple[Future, int]]  # Each write, with the size of the playlist it writes
+    manifest: BuildManifest | None
+    plan_inputs_hash: str
+    files_written: int
+    files_unchanged: int
+    bytes_written: int
+
+    def __init__(
+        self,
+        chapter_index: ChapterIndex,
+        targets: list[str] = TARGETS,
+        m3us_folder: Path = Path("m3us"),
+        max_workers: int = 8,
+        manifest: BuildManifest | None = None,
+        plan_inputs_hash: str = "",
+    ):
+        self.targets = targets
+        self.playlist_entries = [get_playlist_entries(target, chapter_index) for target in targets]
+        self.m3u_folders = [m3us_folder / target for target in targets]
+        for m3u_folder in self.m3u_folders:
+            m3u_folder.mkdir(parents=True, exist_ok=True)
+        self.executor = ThreadPoolExecutor(max_workers)
+        self.pending_writes = deque()
+        self.files_written = 0
+        self.files_unchanged = 0
+        self.bytes_written = 0
+        self.manifest = manifest
+        self.plan_inputs_hash = plan_inputs_hash
+
+    def write(self, date: datetime.date, chapter_ids: list[int]):
+        playlist_filename = get_playlist_filename(date)
+        playlist_header = get_playlist_header(date)
+        for target, m3u_folder, playlist_entries in zip(self.targets, self.m3u_folders, self.playlist_entries):
+            m3u_filename = m3u_folder / playlist_filename
+            if self.manifest:
+                input_hash = get_hash(self.plan_inputs_hash, str(date), target)
+                if self.manifest.is_up_to_date([m3u_filename], input_hash):
+                    self.files_unchanged += 1
+                    continue
+                self.manifest.record([m3u_filename], input_hash)
+            playlist = playlist_header + "".join([playlist_entries[chapter_id] for chapter_id in chapter_ids])
+            content = playlist.encode("utf-8")
+            if len(self.pending_writes) >= MAX_PENDING_WRITES:
+                self.count_write(*self.pending_writes.popleft())
+            self.pending_writes.append((self.executor.submit(write_if_changed, m3u_filename, content), len(content)))
+
+    def count_write(self, pending_write: Future, size: int):
+        if pending_write.result():
+            self.files_written += 1
+            self.bytes_written += size
+        else:
+            self.files_unchanged += 1
+
+    def close(self):
+        try:
+            while self.pending_writes:
+                self.count_write(*self.pending_writes.popleft())
+        finally:
+            self.executor.shutdown(cancel_futures=True)
+
+    def abort(self):
+        # Each playlist is written in one call, so those already written are whole, and only the rest are dropped
+        self.executor.shutdown(cancel_futures=True)
 
 
 def main():
-    create_playlists("windows")
-    create_playlists("android")
+    parser = argparse.ArgumentParser(description="Create the plan's daily .m3u playlists")
+    parser.add_argument("--force", action="store_true", help="rewrite every file, even if its inputs haven't changed")
+    parser.add_argument("--plan-file", help="read the plan's days from this plan file, rather than computing them")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    profiler = StageProfiler(args.profile is not None, args.cprofile_folder)
+    with profiler.stage("loading book info"):
+        chapter_index = ChapterIndex(get_canon())
+    with profiler.stage("building group readings"):
+        plan_spec = get_plan_spec(get_book_groups(), chapter_index)
+        plan_position = plan_spec.get_position(START_DATE)
+    manifest = BuildManifest(force=args.force)
+    with profiler.stage("opening outputs"):
+        plan_inputs_hash = (
+            get_file_hash(args.plan_file) if args.plan_file else get_plan_inputs_hash(plan_spec, plan_position)
+        )
+        playlist_sink = PlaylistSink(chapter_index, manifest=manifest, plan_inputs_hash=plan_inputs_hash)
+    with profiler.stage("writing plan"):
+        if args.plan_file:
+            with PlanFile(args.plan_file) as plan_file:
+                write_days(plan_file.iter_days(), profiler.wrap_sinks([playlist_sink]))
+        else:
+            write_plan(START_DATE, END_DATE, plan_spec, plan_position, profiler.wrap_sinks([playlist_sink]))
+    profiler.add_sink_stages("writing plan")
+    manifest.save()
+    profiler.write_report(args.profile)
+    print(f"Wrote {playlist_sink.files_written} playlists ({playlist_sink.files_unchanged} were already up to date)")
 
 
 if __name__ == "__main__":
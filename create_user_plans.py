@@ -0,0 +1,180 @@
+import argparse
+import csv
+import datetime
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from canon import get_canon
+from create_plan import (
+    ChapterIndex,
+    PlanSpec,
+    get_book_groups,
+    get_plan_spec,
+    get_readings_sinks,
+    write_plan,
+)
+from create_playlists import PlaylistSink
+
+
+@dataclass
+class UserPlanConfig:
+    user: str
+    start_date: datetime.date
+    end_date: datetime.date
+    reading_indexes: dict[str, int] = field(default_factory=dict)  # Each group's (0-based) position on start_date
+
+
+@dataclass
+class SharedPlanInfo:
+    """What every user's plan has in common, computed once and sent to each worker process just once"""
+
+    abbreviations: dict[str, str]
+    chapter_index: ChapterIndex
+    plan_spec: PlanSpec
+    output_folder: Path
+    playlists: bool
+
+
+# Set in each worker process by init_worker()
+shared_plan_info: SharedPlanInfo
+
+
+def init_worker(plan_info: SharedPlanInfo):
+    global shared_plan_info
+    shared_plan_info = plan_info
+
+
+def read_user_plan_configs(users_filename: str, group_names: list[str]) -> tuple[list[UserPlanConfig], dict[str, str]]:
+    """Reads a CSV file with user, start_date and end_date columns, along with an optional column per group (named for
+    the group) giving its (0-based) position on start_date
+
+    Returns the plan configs of the valid rows, and the error message for each invalid one, by user (or, for a row
+    whose user can't be used, by line number). Only the first of a user's rows is used.
+    """
+
+    user_plan_configs: list[UserPlanConfig] = []
+    errors: dict[str, str] = {}
+    users: set[str] = set()
+    with open(users_filename, "r", encoding="utf-8") as csv_file:
+        reader = csv.DictReader(csv_file)
+        for row in reader:
+            user = row["user"]
+            if not user or user != Path(user).name or user in (".", ".."):
+                errors[f"line {reader.line_num}"] = (
+                    f"The user ('{user}') can't be used as the name of the user's output folder."
+                )
+                continue
+            if user in users:
+                errors[f"line {reader.line_num}"] = f"The user ('{user}') is already on an earlier line."
+                continue
+            users.add(user)
+            try:
+                reading_indexes = {
+                    group_name: int(row[group_name])
+                    for group_name in group_names
+                    if (row.get(group_name) or "").strip()
+                }
+                user_plan_config = UserPlanConfig(
+                    user,
+                    datetime.date.fromisoformat(row["start_date"]),
+                    datetime.date.fromisoformat(row["end_date"]),
+                    reading_indexes,
+                )
+                if user_plan_config.end_date < user_plan_config.start_date:
+                    raise ValueError(f"The end date ({user_plan_config.end_date}) is before the start date.")
+            except (ValueError, TypeError, KeyError) as error:
+                errors[user] = f"{type(error).__name__}: {error}"
+                continue
+            user_plan_configs.append(user_plan_config)
+
+    return user_plan_configs, errors
+
+
+def create_user_plan(user_plan_config: UserPlanConfig) -> tuple[str, str | None]:
+    """Writes a user's plan to the user's own output folder, returning the user and any error message"""
+
+    try:
+        if user_plan_config.end_date < user_plan_config.start_date:
+            raise ValueError(f"The end date ({user_plan_config.end_date}) is before the start date.")
+        plan_info = shared_plan_info
+        user_folder = plan_info.output_folder / user_plan_config.user
+        user_folder.mkdir(parents=True, exist_ok=True)
+        plan_spec = plan_info.plan_spec
+        plan_position = plan_spec.get_position(user_plan_config.start_date, user_plan_config.reading_indexes)
+        sinks = get_readings_sinks(
+            user_folder,
+            user_plan_config.start_date,
+            user_plan_config.end_date,
+            plan_spec,
+            plan_position,
+            plan_info.abbreviations,
+            plan_info.chapter_index,
+        )
+        if plan_info.playlists:
+            sinks.append(PlaylistSink(plan_info.chapter_index, m3us_folder=user_folder / "m3us", max_workers=2))
+        write_plan(user_plan_config.start_date, user_plan_config.end_date, plan_spec, plan_position, sinks)
+    except Exception as error:
+        return user_plan_config.user, f"{type(error).__name__}: {error}"
+
+    return user_plan_config.user, None
+
+
+def create_user_plans(
+    user_plan_configs: list[UserPlanConfig],
+    output_folder: Path,
+    playlists: bool = False,
+    max_workers: int | None = None,
+) -> dict[str, str]:
+    """Writes every user's plan, spread across a pool of processes, returning the error message for each failed user"""
+
+    canon = get_canon()
+    chapter_index = ChapterIndex(canon)
+    plan_spec = get_plan_spec(get_book_groups(), chapter_index)
+    plan_info = SharedPlanInfo(dict(canon.abbreviations), chapter_index, plan_spec, output_folder, playlists)
+
+    max_workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, len(user_plan_configs) // (max_workers * 4))
+    errors: dict[str, str] = {}
+    with ProcessPoolExecutor(max_workers, initializer=init_worker, initargs=(plan_info,)) as executor:
+        for user, error in executor.map(create_user_plan, user_plan_configs, chunksize=chunksize):
+            if error:
+                errors[user] = error
+
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create a personalized plan for each user in a CSV file")
+    parser.add_argument(
+        "users_filename",
+        help="CSV file with user, start_date and end_date columns, and optionally a starting position column per group",
+    )
+    parser.add_argument("--output-folder", default="user_plans", help="each user's plan is written to a subfolder")
+    parser.add_argument("--playlists", action="store_true", help="also write each user's daily .m3u playlists")
+    parser.add_argument("--workers", type=int, help="number of worker processes (default: number of CPUs)")
+    args = parser.parse_args()
+
+    group_names = [book_group.group_name for book_group in get_book_groups()]
+    try:
+        user_plan_configs, errors = read_user_plan_configs(args.users_filename, group_names)
+    except (OSError, KeyError, csv.Error) as error:
+        parser.error(f"The users file ({args.users_filename}) can't be read: {error}")
+
+    start_time = time.perf_counter()
+    plan_errors = create_user_plans(user_plan_configs, Path(args.output_folder), args.playlists, args.workers)
+    elapsed_time = time.perf_counter() - start_time
+
+    number_of_plans = len(user_plan_configs) + len(errors)
+    print(f"Created {len(user_plan_configs) - len(plan_errors)} of {number_of_plans} plans in {elapsed_time:.1f}s")
+    errors.update(plan_errors)
+    for user, error in errors.items():
+        print(f"\t{user}: {error}")
+    if errors:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import argparse
+import datetime
+import time
+from pathlib import Path
+
+from canon import get_canon
+from create_plan import START_DATE, ChapterIndex, PlanPosition, PlanSpec, get_book_groups, get_plan_spec
+from create_user_plans import UserPlanConfig, create_user_plans
+
+
+def get_year_plan_configs(
+    plan_spec: PlanSpec, plan_position: PlanPosition, first_year: int, last_year: int
+) -> list[UserPlanConfig]:
+    """Returns a plan config for each year, named for the year, with each group's position on Jan. 1 of that year
+    worked out directly from plan_position, rather than by stepping through the years before it"""
+
+    year_plan_configs: list[UserPlanConfig] = []
+    for year in range(first_year, last_year + 1):
+        start_date = datetime.date(year, 1, 1)
+        year_plan_configs.append(
+            UserPlanConfig(
+                str(year),
+                start_date,
+                datetime.date(year, 12, 31),
+                plan_spec.get_reading_indexes(plan_spec.move(plan_position, start_date)),
+            )
+        )
+
+    return year_plan_configs
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Create the plan for each of a range of years, each year carrying on from the one before it"
+    )
+    parser.add_argument("first_year", type=int)
+    parser.add_argument("last_year", type=int)
+    parser.add_argument(
+        "--start-date",
+        type=datetime.date.fromisoformat,
+        default=START_DATE,
+        help="the plan's first day, on which every group is at its first chapter (default: %(default)s)",
+    )
+    parser.add_argument("--output-folder", default="yearly_plans", help="each year's plan is written to a subfolder")
+    parser.add_argument("--playlists", action="store_true", help="also write each year's daily .m3u playlists")
+    parser.add_argument("--workers", type=int, help="number of worker processes (default: number of CPUs)")
+    args = parser.parse_args()
+    if args.last_year < args.first_year:
+        parser.error(f"The last year ({args.last_year}) is before the first year ({args.first_year}).")
+
+    plan_spec = get_plan_spec(get_book_groups(), ChapterIndex(get_canon()))
+    year_plan_configs = get_year_plan_configs(
+        plan_spec, plan_spec.get_position(args.start_date), args.first_year, args.last_year
+    )
+
+    start_time = time.perf_counter()
+    errors = create_user_plans(year_plan_configs, Path(args.output_folder), args.playlists, args.workers)
+    elapsed_time = time.perf_counter() - start_time
+
+    print(f"Created {len(year_plan_configs) - len(errors)} of {len(year_plan_configs)} plans in {elapsed_time:.1f}s")
+    for year, error in errors.items():
+        print(f"\t{year}: {error}")
+    if errors:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+import argparse
+import datetime
+import math
+
+from canon import get_canon
+from chapter_schedule import get_chapter_positions
+from create_plan import START_DATE, ChapterIndex, PlanPosition, PlanSpec, get_book_groups, get_plan_spec
+
+
+def get_cycle_lengths(plan_spec: PlanSpec) -> dict[str, int]:
+    """Returns the number of days each group takes to read all of its chapters once"""
+
+    return {group.group_name: len(group.chapter_ids) for group in plan_spec.groups}
+
+
+def get_plan_period(plan_spec: PlanSpec) -> int:
+    """Returns the number of days after which the whole plan repeats exactly"""
+
+    return math.lcm(*get_cycle_lengths(plan_spec).values())
+
+
+def solve_congruences(congruences: list[tuple[int, int]]) -> tuple[int, int] | None:
+    """Returns the (residue, modulus) of the days that are congruent to every one of the (residue, modulus) pairs, or
+    None if no day is, by the Chinese remainder theorem (generalized to moduli that share factors)"""
+
+    residue, modulus = 0, 1
+    for other_residue, other_modulus in congruences:
+        divisor = math.gcd(modulus, other_modulus)
+        if (other_residue - residue) % divisor:
+            return None
+        # Solve residue + modulus * k = other_residue (mod other_modulus) for k
+        reduced_modulus = other_modulus // divisor
+        k = (other_residue - residue) // divisor * pow(modulus // divisor, -1, reduced_modulus) % reduced_modulus
+        residue, modulus = residue + modulus * k, modulus * reduced_modulus
+        residue %= modulus
+
+    return residue, modulus
+
+
+def get_next_day(
+    start_date: datetime.date, from_date: datetime.date, congruence: tuple[int, int] | None
+) -> int | None:
+    """Returns the first day of the plan (counting start_date as day 0), on or after from_date, that satisfies the
+    congruence"""
+
+    if congruence is None:
+        return None
+    residue, modulus = congruence
+    first_day = (from_date - start_date).days
+    return first_day + (residue - first_day) % modulus
+
+
+def get_next_realignment(
+    from_date: datetime.date,
+    plan_spec: PlanSpec,
+    plan_position: PlanPosition,
+    group_names: list[str] | None = None,
+) -> int | None:
+    """Returns the first day of the plan (counting the plan position's date as day 0), on or after from_date, on which
+    every one of the named groups (by default, all of them) reads the first chapter of its first book, or None if
+    they never do so together"""
+
+    return get_next_day(
+        plan_position.date,
+        from_date,
+        solve_congruences(
+            [
+                (-reading_index, len(group.chapter_ids))
+                for group, reading_index in zip(plan_spec.groups, plan_position.reading_indexes)
+                if group_names is None or group.group_name in group_names
+            ]
+        ),
+    )
+
+
+def get_next_coincidence(
+    from_date: datetime.date, plan_spec: PlanSpec, plan_position: PlanPosition, chapter_ids: list[int]
+) -> int | None:
+    """Returns the first day of the plan (counting the plan position's date as day 0), on or after from_date, on which
+    all of the chapters are read (each by a different group), or None if they never are"""
+
+    # A chapter given more than once is still just read once, by one group
+    chapter_ids = list(dict.fromkeys(chapter_ids))
+    chapter_positions = get_chapter_positions(plan_spec)
+    if any(chapter_id not in chapter_positions for chapter_id in chapter_ids):
+        return None
+
+    # Try every way of assigning the chapters to groups that read them (there's just the one with the usual groups)
+    assignments: list[list[tuple[int, int]]] = [[]]
+    for chapter_id in chapter_ids:
+        assignments = [
+            assignment + [group_position]
+            for assignment in assignments
+            for group_position in chapter_positions[chapter_id]
+            if group_position[0] not in {group_index for group_index, _ in assignment}
+        ]
+    next_days = [
+        get_next_day(
+            plan_position.date,
+            from_date,
+            solve_congruences(
+                [
+                    (
+                        position - plan_position.reading_indexes[group_index],
+                        len(plan_spec.groups[group_index].chapter_ids),
+                    )
+                    for group_index, position in assignment
+                ]
+            ),
+        )
+        for assignment in assignments
+    ]
+    return min((day for day in next_days if day is not None), default=None)
+
+
+def get_day_description(start_date: datetime.date, day: int | None) -> str:
+    if day is None:
+        return "never"
+    try:
+        return f"{start_date + datetime.timedelta(days=day)} (day {day:,} of the plan)"
+    except OverflowError:
+        return f"day {day:,} of the plan (about {day / 365.2425:,.0f} years after {start_date})"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Work out when the plan's groups line up, from their cycle lengths rather than by generating it"
+    )
+    parser.add_argument(
+        "--start-date",
+        type=datetime.date.fromisoformat,
+        default=START_DATE,
+        help="the plan's first day, on which every group is at its first chapter (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--from",
+        dest="from_date",
+        type=datetime.date.fromisoformat,
+        default=datetime.date.today(),
+        help="find the first day on or after this date (default: today)",
+    )
+    parser.add_argument("--realign", nargs="+", metavar="GROUP", help="groups to find the next realignment of")
+    parser.add_argument(
+        "--coincide", nargs="+", metavar="READING", help='chapters, like "Psalms 23", to find the next day of together'
+    )
+    args = parser.parse_args()
+
+    chapter_index = ChapterIndex(get_canon())
+    plan_spec = get_plan_spec(get_book_groups(), chapter_index)
+    plan_position = plan_spec.get_position(args.start_date)
+
+    print("Days in each group's cycle")
+    for group_name, cycle_length in get_cycle_lengths(plan_spec).items():
+        print(f"\t{group_name}: {cycle_length}")
+    plan_period = get_plan_period(plan_spec)
+    print(f"The whole plan repeats every {plan_period:,} days (about {plan_period / 365.2425:,.0f} years)")
+
+    if args.realign:
+        unknown_group_names = set(args.realign) - set(plan_spec.group_names)
+        if unknown_group_names:
+            parser.error(f"Unknown groups: {', '.join(sorted(unknown_group_names))}")
+    realignment_day = get_next_realignment(args.from_date, plan_spec, plan_position, args.realign)
+    print(
+        f"Next day on which {', '.join(args.realign) if args.realign else 'every group'} starts over together:"
+        f" {get_day_description(args.start_date, realignment_day)}"
+    )
+
+    if args.coincide:
+        try:
+            chapter_ids = [chapter_index.get_reading_id(reading) for reading in args.coincide]
+        except ValueError as error:
+            parser.error(str(error))
+        coincidence_day = get_next_coincidence(args.from_date, plan_spec, plan_position, chapter_ids)
+        print(
+            f"Next day on which {', '.join(args.coincide)} are all read:"
+            f" {get_day_description(args.start_date, coincidence_day)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import functools
+import string
+from html import escape
+from typing import Iterable, TextIO
+
+# The markup matches that of PrettyTable.get_html_string(), but is written a row at a time straight to the file
+HTML_TABLE_HEADER_START = "    <thead>\n        <tr>\n"
+HTML_TABLE_HEADER_END = "        </tr>\n    </thead>\n    <tbody>\n"
+HTML_TABLE_ROW_START = "        <tr>\n            <td>"
+HTML_TABLE_CELL_SEPARATOR = "</td>\n            <td>"
+HTML_TABLE_ROW_END = "</td>\n        </tr>\n"
+HTML_TABLE_END = "    </tbody>\n</table>"
+
+
+def get_html_table_start(column_names: list[str], table_attributes: str = "") -> str:
+    """Returns the table's opening tag and header, along with the opening tag of its body"""
+
+    header_cells = "".join(f"            <th>{escape(column_name)}</th>\n" for column_name in column_names)
+    return f"<table{table_attributes}>\n{HTML_TABLE_HEADER_START}{header_cells}{HTML_TABLE_HEADER_END}"
+
+
+def get_html_table_row(cells: list[str]) -> str:
+    return f"{HTML_TABLE_ROW_START}{HTML_TABLE_CELL_SEPARATOR.join(map(escape, cells))}{HTML_TABLE_ROW_END}"
+
+
+def write_html_table(html_file: TextIO, column_names: list[str], rows: Iterable[list[str]], table_attributes: str = ""):
+    html_file.write(get_html_table_start(column_names, table_attributes))
+    html_file.writelines(map(get_html_table_row, rows))
+    html_file.write(HTML_TABLE_END)
+
+
+@functools.cache
+def read_template(template_filename: str) -> str:
+    with open(template_filename, "r", encoding="utf-8") as template_file:
+        return template_file.read()
+
+
+def get_template_fragments(template_filename: str, placeholder: str, **substitutions: str) -> tuple[str, str]:
+    """Splits the template around placeholder, which the caller then streams its own content in place of
+
+    The template's other placeholders are filled in from substitutions.
+    """
+
+    before_placeholder, after_placeholder = read_template(template_filename).split(f"${{{placeholder}}}")
+    return (
+        string.Template(before_placeholder).substitute(substitutions),
+        string.Template(after_placeholder).substitute(substitutions),
+    )
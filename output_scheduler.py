@@ -0,0 +1,84 @@
+import datetime
+import os
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import numpy as np
+
+# Number of days of the plan converted to lists at a time, so that no output holds more than that many in memory
+DAYS_PER_CHUNK = 366
+
+
+@dataclass
+class OutputJob:
+    """One of the plan's outputs, whose sink (with write(), close() and abort() methods) is made by make_sink in
+    whichever thread or process writes it
+
+    Outputs that spend most of their time rendering, rather than waiting on I/O, are better written in a process of
+    their own (in which case make_sink must be picklable, such as a functools.partial of the sink's class).
+    """
+
+    name: str
+    make_sink: Callable[[], Any]
+    in_process: bool = False
+
+
+def write_output(output_job: OutputJob, start_date: datetime.date, plan_matrix: np.ndarray) -> str | None:
+    """Writes the plan (a days x groups matrix of chapter ids, its first day being start_date) to the job's sink,
+    returning any error message
+
+    If writing fails, the sink is aborted rather than closed, so that it doesn't leave a truncated output looking
+    complete.
+    """
+
+    try:
+        sink = output_job.make_sink()
+        try:
+            date = start_date
+            for chunk_start in range(0, len(plan_matrix), DAYS_PER_CHUNK):
+                for chapter_ids in plan_matrix[chunk_start : chunk_start + DAYS_PER_CHUNK].tolist():
+                    sink.write(date, chapter_ids)
+                    date += datetime.timedelta(days=1)
+            sink.close()
+        except BaseException:
+            sink.abort()
+            raise
+    except Exception as error:
+        return f"{type(error).__name__}: {error}"
+
+    return None
+
+
+def write_outputs(
+    start_date: datetime.date,
+    plan_matrix: np.ndarray,
+    output_jobs: list[OutputJob],
+    max_processes: int | None = None,
+) -> dict[str, str]:
+    """Writes the same plan to every output at once, each in a thread of its own or, if it's in_process, in one of a
+    pool of processes, returning the error message for each output that failed"""
+
+    plan_matrix.flags.writeable = False
+    thread_jobs = [output_job for output_job in output_jobs if not output_job.in_process]
+    process_jobs = [output_job for output_job in output_jobs if output_job.in_process]
+
+    pending_outputs: dict[Future, str] = {}
+    with ThreadPoolExecutor(max(1, len(thread_jobs))) as thread_executor, ProcessPoolExecutor(
+        min(max(1, len(process_jobs)), max_processes or os.cpu_count() or 1)
+    ) as process_executor:
+        # The process jobs go first, so that the pool's worker processes are forked before any thread is running
+        for output_job in process_jobs + thread_jobs:
+            executor = process_executor if output_job.in_process else thread_executor
+            pending_outputs[executor.submit(write_output, output_job, start_date, plan_matrix)] = output_job.name
+
+        errors: dict[str, str] = {}
+        for pending_output, name in pending_outputs.items():
+            try:
+                error = pending_output.result()
+            except Exception as error_running_output:
+                error = f"{type(error_running_output).__name__}: {error_running_output}"
+            if error:
+                errors[name] = error
+
+    return errors
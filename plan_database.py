@@ -0,0 +1,138 @@
+"""A SQLite database of the plan, for ad-hoc queries: a readings table keyed by date and group, indexed on chapter id,
+along with the canon's books and chapters
+
+To find the days on which John 3 is read, for example:
+
+    SELECT date, group_name FROM readings JOIN chapters USING (chapter_id) WHERE reading = 'John 3'
+
+The chapter ids are create_plan.ChapterIndex's (from 0 for Genesis 1 to 1188 for Revelation 22).
+"""
+
+import argparse
+import datetime
+import itertools
+import sqlite3
+from pathlib import Path
+
+from canon import Canon, get_canon
+from plan_file import PlanFile
+
+# The readings' primary key, which starts with the date, doubles as the index on date
+PLAN_DATABASE_SCHEMA = """
+CREATE TABLE books (
+    book_ordinal INTEGER PRIMARY KEY,
+    book TEXT NOT NULL UNIQUE,
+    abbreviation TEXT NOT NULL,
+    chapters INTEGER NOT NULL,
+    testament TEXT NOT NULL,
+    first_chapter_id INTEGER NOT NULL
+);
+CREATE TABLE chapters (
+    chapter_id INTEGER PRIMARY KEY,
+    book_ordinal INTEGER NOT NULL REFERENCES books,
+    chapter INTEGER NOT NULL,
+    reading TEXT NOT NULL UNIQUE
+);
+CREATE TABLE readings (
+    date TEXT NOT NULL,
+    group_name TEXT NOT NULL,
+    chapter_id INTEGER NOT NULL REFERENCES chapters,
+    PRIMARY KEY (date, group_name)
+) WITHOUT ROWID;
+"""
+# Made once every reading's inserted, which is quicker than keeping it up to date row by row
+PLAN_DATABASE_INDEX = "CREATE INDEX readings_chapter_id ON readings (chapter_id)"
+
+# Number of readings inserted by each executemany()
+ROWS_PER_BATCH = 10_000
+
+
+class PlanDatabaseSink:
+    """Inserts each day's readings into a new plan database as they're produced by create_plan.write_plan(), in
+    batches, all in one transaction"""
+
+    name: str
+    filename: Path
+    group_names: list[str]
+    connection: sqlite3.Connection
+    pending_rows: list[tuple[str, str, int]]
+    bytes_written: int
+
+    def __init__(self, filename: str | Path, group_names: list[str], canon: Canon):
+        self.name = Path(filename).name
+        self.filename = Path(filename)
+        self.group_names = group_names
+        self.pending_rows = []
+        self.bytes_written = 0
+
+        self.filename.unlink(missing_ok=True)
+        self.connection = sqlite3.connect(self.filename, isolation_level=None)
+        # The database is written from scratch, so if writing it fails it's simply written again
+        self.connection.execute("PRAGMA journal_mode = OFF")
+        self.connection.execute("PRAGMA synchronous = OFF")
+        self.connection.executescript(PLAN_DATABASE_SCHEMA)
+        self.connection.execute("BEGIN")
+        self.connection.executemany(
+            "INSERT INTO books VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    canon.book_ordinals[book],
+                    book,
+                    abbreviation,
+                    chapter_count,
+                    canon.testaments[book],
+                    canon.first_chapter_ids[book],
+                )
+                for book, abbreviation, chapter_count in canon.book_info
+            ),
+        )
+        self.connection.executemany(
+            "INSERT INTO chapters VALUES (?, ?, ?, ?)",
+            (
+                (canon.first_chapter_ids[book] + chapter - 1, canon.book_ordinals[book], chapter, f"{book} {chapter}")
+                for book, _, chapter_count in canon.book_info
+                for chapter in range(1, chapter_count + 1)
+            ),
+        )
+
+    def write(self, date: datetime.date, chapter_ids: list[int]):
+        self.pending_rows.extend(zip(itertools.repeat(str(date)), self.group_names, chapter_ids))
+        if len(self.pending_rows) >= ROWS_PER_BATCH:
+            self.insert_pending_rows()
+
+    def insert_pending_rows(self):
+        self.connection.executemany("INSERT INTO readings VALUES (?, ?, ?)", self.pending_rows)
+        self.pending_rows = []
+
+    def close(self):
+        try:
+            self.insert_pending_rows()
+            self.connection.execute(PLAN_DATABASE_INDEX)
+            self.connection.execute("COMMIT")
+        finally:
+            self.connection.close()
+        self.bytes_written = self.filename.stat().st_size
+
+    def abort(self):
+        # Closing without committing drops the readings, but the journal's off, so the file itself is deleted too
+        self.connection.close()
+        self.filename.unlink(missing_ok=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load a plan file (see plan_file.py) into a new SQLite database")
+    parser.add_argument("plan_filename")
+    parser.add_argument("database_filename", nargs="?", help="(default: the plan file's name, ending in .sqlite)")
+    args = parser.parse_args()
+
+    database_filename = args.database_filename or Path(args.plan_filename).with_suffix(".sqlite")
+    with PlanFile(args.plan_filename) as plan_file:
+        plan_database_sink = PlanDatabaseSink(database_filename, plan_file.group_names, get_canon())
+        for date, chapter_ids in plan_file.iter_days():
+            plan_database_sink.write(date, chapter_ids)
+        plan_database_sink.close()
+    print(f"Wrote {database_filename} ({plan_database_sink.bytes_written:,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import datetime
+
+START_DATE = datetime.date(2023, 1, 1)
+END_DATE = datetime.date(2023, 12, 31)
+
+BIBLE_BOOK_INFO_FILENAME = "bible_book_info.csv"
+
+# The plan's groups, each with the books (in bible_book_info.csv) whose chapters it reads one a day, in turn
+BOOK_GROUPS: dict[str, list[str]] = {
+    "Gospels": ["Matthew", "Mark", "Luke", "John"],
+    "Pentateuch": ["Genesis", "Exodus", "Leviticus", "Numbers", "Deuteronomy"],
+    "Epistles1": [
+        "Romans",
+        "1 Corinthians",
+        "2 Corinthians",
+        "Galatians",
+        "Ephesians",
+        "Philippians",
+        "Colossians",
+        "Hebrews",
+    ],
+    "Epistles2": [
+        "1 Thessalonians",
+        "2 Thessalonians",
+        "1 Timothy",
+        "2 Timothy",
+        "Titus",
+        "Philemon",
+        "James",
+        "1 Peter",
+        "2 Peter",
+        "1 John",
+        "2 John",
+        "3 John",
+        "Jude",
+        "Revelation",
+    ],
+    "Wisdom": ["Job", "Ecclesiastes", "Song of Songs"],
+    "Psalms": ["Psalms"],
+    "Proverbs": ["Proverbs"],
+    "History": [
+        "Joshua",
+        "Judges",
+        "Ruth",
+        "1 Samuel",
+        "2 Samuel",
+        "1 Kings",
+        "2 Kings",
+        "1 Chronicles",
+        "2 Chronicles",
+        "Ezra",
+        "Nehemiah",
+        "Esther",
+    ],
+    "Prophets": [
+        "Isaiah",
+        "Jeremiah",
+        "Lamentations",
+        "Ezekiel",
+        "Daniel",
+        "Hosea",
+        "Joel",
+        "Amos",
+        "Obadiah",
+        "Jonah",
+        "Micah",
+        "Nahum",
+        "Habakkuk",
+        "Zephaniah",
+        "Haggai",
+        "Zechariah",
+        "Malachi",
+    ],
+    "Acts": ["Acts"],
+}
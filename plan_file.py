@@ -0,0 +1,118 @@
+"""A binary plan file: a small header, then the plan's days x groups chapter ids, each a little-endian unsigned short
+
+Readers memory-map the file, and read any day's chapter ids straight from its offset, without parsing anything. The
+chapter ids are create_plan.ChapterIndex's (from 0 for Genesis 1 to 1188 for Revelation 22).
+"""
+
+import datetime
+import mmap
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+PLAN_FILE_MAGIC = b"HBRPLAN\0"
+PLAN_FILE_VERSION = 1
+
+# Magic, version, number of groups, start date (as an ordinal), number of days, and the offset of the first day's row.
+# The group names follow, newline-separated in UTF-8, padded with zeros up to that offset (a multiple of 8).
+PLAN_FILE_HEADER = struct.Struct("<8sHHIII")
+
+
+class PlanFileSink:
+    """Writes each day's chapter ids to a plan file as they're produced by create_plan.write_plan()"""
+
+    name: str
+    plan_file: BinaryIO
+    bytes_written: int
+
+    def __init__(
+        self, filename: str | Path, start_date: datetime.date, end_date: datetime.date, group_names: list[str]
+    ):
+        self.name = Path(filename).name
+        group_names_bytes = "\n".join(group_names).encode("utf-8")
+        data_offset = -(-(PLAN_FILE_HEADER.size + len(group_names_bytes)) // 8) * 8
+        self.plan_file = open(filename, "wb")
+        self.plan_file.write(
+            PLAN_FILE_HEADER.pack(
+                PLAN_FILE_MAGIC,
+                PLAN_FILE_VERSION,
+                len(group_names),
+                start_date.toordinal(),
+                (end_date - start_date).days + 1,
+                data_offset,
+            )
+        )
+        self.plan_file.write(group_names_bytes.ljust(data_offset - PLAN_FILE_HEADER.size, b"\0"))
+        self.bytes_written = 0
+
+    def write(self, date: datetime.date, chapter_ids: list[int]):
+        row = array("H", chapter_ids)
+        if sys.byteorder == "big":
+            row.byteswap()
+        self.plan_file.write(row.tobytes())
+
+    def close(self):
+        self.bytes_written = self.plan_file.tell()
+        self.plan_file.close()
+
+    def abort(self):
+        self.plan_file.close()
+        Path(self.plan_file.name).unlink(missing_ok=True)
+
+
+class PlanFile:
+    """A memory-mapped plan file, from which any day's chapter ids are read by offset"""
+
+    start_date: datetime.date
+    number_of_days: int
+    group_names: list[str]
+    plan_mmap: mmap.mmap
+    data_offset: int
+    row: struct.Struct
+
+    def __init__(self, filename: str | Path):
+        with open(filename, "rb") as plan_file:
+            self.plan_mmap = mmap.mmap(plan_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, number_of_groups, start_ordinal, self.number_of_days, self.data_offset = (
+                PLAN_FILE_HEADER.unpack_from(self.plan_mmap)
+            )
+            if magic != PLAN_FILE_MAGIC or version != PLAN_FILE_VERSION:
+                raise ValueError(f"{filename} isn't a version {PLAN_FILE_VERSION} plan file.")
+            self.row = struct.Struct(f"<{number_of_groups}H")
+            if len(self.plan_mmap) != self.data_offset + self.number_of_days * self.row.size:
+                raise ValueError(f"{filename} isn't the size its header says it is.")
+        except (ValueError, struct.error):
+            self.plan_mmap.close()
+            raise
+
+        self.start_date = datetime.date.fromordinal(start_ordinal)
+        group_names = self.plan_mmap[PLAN_FILE_HEADER.size : self.data_offset].rstrip(b"\0").decode("utf-8")
+        self.group_names = group_names.split("\n") if number_of_groups else []
+
+    @property
+    def end_date(self) -> datetime.date:
+        return self.start_date + datetime.timedelta(days=self.number_of_days - 1)
+
+    def get_chapter_ids(self, date: datetime.date) -> list[int]:
+        day = (date - self.start_date).days
+        if not 0 <= day < self.number_of_days:
+            raise ValueError(f"The date ({date}) isn't in the plan ({self.start_date} to {self.end_date}).")
+        return list(self.row.unpack_from(self.plan_mmap, self.data_offset + day * self.row.size))
+
+    def iter_days(self) -> Iterator[tuple[datetime.date, list[int]]]:
+        date = self.start_date
+        for offset in range(self.data_offset, len(self.plan_mmap), self.row.size):
+            yield date, list(self.row.unpack_from(self.plan_mmap, offset))
+            date += datetime.timedelta(days=1)
+
+    def close(self):
+        self.plan_mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
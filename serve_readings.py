@@ -0,0 +1,184 @@
+import argparse
+import asyncio
+import datetime
+import functools
+import io
+import json
+from typing import Callable
+from urllib.parse import parse_qs, urlsplit
+
+from canon import get_canon
+from create_plan import (
+    MONTH_TABLE_ATTRIBUTES,
+    START_DATE,
+    ChapterIndex,
+    PlanPosition,
+    PlanSpec,
+    get_book_groups,
+    get_days_readings_formatted,
+    get_days_readings_raw,
+    get_plan_spec,
+    get_reading_labels,
+)
+from html_tables import write_html_table
+
+MAX_DAYS_PER_REQUEST = 366
+RESPONSE_CACHE_SIZE = 4096
+STATUS_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+
+class ReadingsService:
+    """Answers requests for a plan's readings, computing them directly from the plan's start date and starting
+    positions, and remembering the most recently requested responses"""
+
+    chapter_index: ChapterIndex
+    reading_labels: list[str]
+    plan_spec: PlanSpec  # Shared by every request, each of which has its own PlanPosition
+    column_names: list[str]
+    get_response: Callable[..., tuple[str, bytes]]
+
+    def __init__(self, response_cache_size: int = RESPONSE_CACHE_SIZE):
+        canon = get_canon()
+        self.chapter_index = ChapterIndex(canon)
+        self.reading_labels = get_reading_labels(canon.abbreviations, self.chapter_index)
+        self.plan_spec = get_plan_spec(get_book_groups(), self.chapter_index)
+        self.column_names = ["Date"] + self.plan_spec.group_names
+        self.get_response = functools.lru_cache(maxsize=response_cache_size)(self._get_response)
+
+    def parse_query(self, query: str) -> tuple[PlanPosition, datetime.date, datetime.date, str]:
+        """Returns the response cache key for a query like
+        "date=2024-03-01&end_date=2024-03-07&start_date=2024-01-01&Gospels=28&format=html"
+
+        Every parameter is optional: date defaults to today, end_date to date, start_date (the plan's first day) to
+        create_plan.START_DATE, each group's 0-based position on start_date to 0, and format to "json".
+        """
+
+        params = {name: values[-1] for name, values in parse_qs(query).items()}
+        date = datetime.date.fromisoformat(params["date"]) if "date" in params else datetime.date.today()
+        end_date = datetime.date.fromisoformat(params["end_date"]) if "end_date" in params else date
+        start_date = datetime.date.fromisoformat(params["start_date"]) if "start_date" in params else START_DATE
+        if not 0 <= (end_date - date).days < MAX_DAYS_PER_REQUEST:
+            raise ValueError(f"The end_date must be from 0 to {MAX_DAYS_PER_REQUEST - 1} days after the date.")
+        response_format = params.get("format", "json")
+        if response_format not in ("json", "html"):
+            raise ValueError("The format must be json or html.")
+        reading_indexes = {
+            group_name: int(params[group_name]) for group_name in self.plan_spec.group_names if group_name in params
+        }
+        plan_position = self.plan_spec.get_position(start_date, reading_indexes)
+
+        return plan_position, date, end_date, response_format
+
+    def _get_response(
+        self,
+        plan_position: PlanPosition,
+        date: datetime.date,
+        end_date: datetime.date,
+        response_format: str,
+    ) -> tuple[str, bytes]:
+        """Returns the content type and body of the response for the plan's readings from date thru end_date, given
+        the groups' positions on the plan's start date"""
+
+        plan_matrix = self.plan_spec.get_plan_matrix(plan_position, date, end_date)
+        days = [
+            (date + datetime.timedelta(days=day), chapter_ids) for day, chapter_ids in enumerate(plan_matrix.tolist())
+        ]
+
+        if response_format == "html":
+            html_fragment = io.StringIO()
+            write_html_table(
+                html_fragment,
+                self.column_names,
+                (
+                    get_days_readings_formatted(day_date, chapter_ids, self.reading_labels)
+                    for day_date, chapter_ids in days
+                ),
+                MONTH_TABLE_ATTRIBUTES,
+            )
+            return "text/html; charset=utf-8", html_fragment.getvalue().encode()
+
+        readings = [
+            dict(zip(self.column_names, get_days_readings_raw(day_date, chapter_ids, self.chapter_index)))
+            for day_date, chapter_ids in days
+        ]
+        return "application/json", json.dumps({"start_date": str(plan_position.date), "readings": readings}).encode()
+
+    def respond(self, method: str, target: str) -> tuple[int, str, bytes]:
+        """Returns the status, content type and body of the response to an HTTP request"""
+
+        url = urlsplit(target)
+        if url.path != "/readings":
+            return get_error_response(404, f"There's nothing at {url.path}; try /readings.")
+        if method != "GET":
+            return get_error_response(405, "Only GET requests are supported.")
+        try:
+            content_type, body = self.get_response(*self.parse_query(url.query))
+        except ValueError as error:
+            return get_error_response(400, str(error))
+        return 200, content_type, body
+
+
+def get_error_response(status: int, message: str) -> tuple[int, str, bytes]:
+    return status, "application/json", json.dumps({"error": message}).encode()
+
+
+async def handle_connection(service: ReadingsService, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """Answers each HTTP/1.1 request on the connection in turn, until the client closes it or asks for it to be
+    closed"""
+
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line.strip():
+                break
+            keep_alive = not request_line.rstrip().endswith(b"HTTP/1.0")
+            while (header_line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                name, _, value = header_line.decode("latin-1").partition(":")
+                if name.strip().lower() == "connection":
+                    keep_alive = value.strip().lower() == "keep-alive"
+
+            try:
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                status, content_type, body = service.respond(method, target)
+            except ValueError:
+                status, content_type, body = get_error_response(400, "The request line is malformed.")
+                keep_alive = False
+
+            writer.write(
+                f"HTTP/1.1 {status} {STATUS_REASONS[status]}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1")
+                + body
+            )
+            await writer.drain()
+            if not keep_alive:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host: str, port: int, service: ReadingsService):
+    server = await asyncio.start_server(functools.partial(handle_connection, service), host, port, backlog=4096)
+    print(f"Serving readings at http://{host}:{port}/readings")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a plan's readings for any date as JSON or HTML")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--cache-size", type=int, default=RESPONSE_CACHE_SIZE, help="number of responses remembered")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, ReadingsService(args.cache_size)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
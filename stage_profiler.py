@@ -0,0 +1,156 @@
+import contextlib
+import cProfile
+import datetime
+import json
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Iterator
+
+PROFILE_REPORT_FILENAME = "profile-report.json"
+
+
+class ProfiledSink:
+    """Passes each day through to a sink, timing the sink, and separately the formatting of each day's readings (when
+    the sink has a get_days_readings() function)"""
+
+    def __init__(self, sink):
+        self.name = getattr(sink, "name", type(sink).__name__)
+        self.sink = sink
+        self.rows = 0
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.formatting_wall_seconds = 0.0
+        self.formatting_cpu_seconds = 0.0
+        if hasattr(sink, "get_days_readings"):
+            get_days_readings = sink.get_days_readings
+
+            def get_days_readings_timed(date: datetime.date, chapter_ids: list[int]) -> list[str]:
+                start_wall, start_cpu = time.perf_counter(), time.process_time()
+                days_readings = get_days_readings(date, chapter_ids)
+                self.formatting_wall_seconds += time.perf_counter() - start_wall
+                self.formatting_cpu_seconds += time.process_time() - start_cpu
+                return days_readings
+
+            sink.get_days_readings = get_days_readings_timed
+
+    def write(self, date: datetime.date, chapter_ids: list[int]):
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+        self.sink.write(date, chapter_ids)
+        self.wall_seconds += time.perf_counter() - start_wall
+        self.cpu_seconds += time.process_time() - start_cpu
+        self.rows += 1
+
+    def close(self):
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+        self.sink.close()
+        self.wall_seconds += time.perf_counter() - start_wall
+        self.cpu_seconds += time.process_time() - start_cpu
+
+    def abort(self):
+        self.sink.abort()
+
+
+class StageProfiler:
+    """Measures the wall time, CPU time and peak (tracemalloc) memory of each stage of a run, and optionally dumps a
+    cProfile of each stage to profile_folder
+
+    When it isn't enabled, stages and sinks run just as they would without it.
+    """
+
+    enabled: bool
+    profile_folder: Path | None
+    stages: list[dict]
+    profiled_sinks: list[ProfiledSink]
+
+    def __init__(self, enabled: bool = True, profile_folder: Path | None = None):
+        self.enabled = enabled
+        self.profile_folder = profile_folder
+        self.stages = []
+        self.profiled_sinks = []
+        if enabled:
+            tracemalloc.start()
+            if profile_folder:
+                profile_folder.mkdir(parents=True, exist_ok=True)
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[dict]:
+        """Measures the enclosed code as the named stage, yielding its (initially empty) stats, to which counts of
+        rows and bytes written can be added"""
+
+        stats: dict = {}
+        if not self.enabled:
+            yield stats
+            return
+
+        profiler = cProfile.Profile() if self.profile_folder else None
+        tracemalloc.reset_peak()
+        start_memory = tracemalloc.get_traced_memory()[0]
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+        if profiler:
+            profiler.enable()
+        try:
+            yield stats
+        finally:
+            if profiler:
+                profiler.disable()
+            wall_seconds, cpu_seconds = time.perf_counter() - start_wall, time.process_time() - start_cpu
+            self.stages.append(
+                {
+                    "stage": name,
+                    "wall_seconds": round(wall_seconds, 6),
+                    "cpu_seconds": round(cpu_seconds, 6),
+                    "peak_memory_bytes": tracemalloc.get_traced_memory()[1] - start_memory,
+                    **stats,
+                }
+            )
+            if profiler:
+                profiler.dump_stats(self.profile_folder / f"{name.replace(' ', '-')}.prof")
+
+    def wrap_sinks(self, sinks: list) -> list:
+        """Returns the sinks to pass to write_plan(), each timed on its own when the profiler is enabled"""
+
+        if not self.enabled:
+            return sinks
+        self.profiled_sinks = [ProfiledSink(sink) for sink in sinks]
+        return self.profiled_sinks
+
+    def add_sink_stages(self, write_plan_stage: str):
+        """Splits the named stage (which ran write_plan() with the wrapped sinks) into generating, formatting and each
+        writer's own stage"""
+
+        if not self.enabled:
+            return
+        write_plan_stats = next(stage for stage in self.stages if stage["stage"] == write_plan_stage)
+        sink_wall_seconds = sum(profiled_sink.wall_seconds for profiled_sink in self.profiled_sinks)
+        sink_cpu_seconds = sum(profiled_sink.cpu_seconds for profiled_sink in self.profiled_sinks)
+        self.stages.append(
+            {
+                "stage": "generating",
+                "wall_seconds": round(write_plan_stats["wall_seconds"] - sink_wall_seconds, 6),
+                "cpu_seconds": round(write_plan_stats["cpu_seconds"] - sink_cpu_seconds, 6),
+            }
+        )
+        self.stages.append(
+            {
+                "stage": "formatting",
+                "wall_seconds": round(sum(sink.formatting_wall_seconds for sink in self.profiled_sinks), 6),
+                "cpu_seconds": round(sum(sink.formatting_cpu_seconds for sink in self.profiled_sinks), 6),
+            }
+        )
+        for profiled_sink in self.profiled_sinks:
+            self.stages.append(
+                {
+                    "stage": f"writing {profiled_sink.name}",
+                    "wall_seconds": round(profiled_sink.wall_seconds - profiled_sink.formatting_wall_seconds, 6),
+                    "cpu_seconds": round(profiled_sink.cpu_seconds - profiled_sink.formatting_cpu_seconds, 6),
+                    "rows": profiled_sink.rows,
+                    "bytes_written": getattr(profiled_sink.sink, "bytes_written", None),
+                }
+            )
+
+    def write_report(self, report_filename: str | Path):
+        if not self.enabled:
+            return
+        tracemalloc.stop()
+        Path(report_filename).write_text(json.dumps({"stages": self.stages}, indent=4) + "\n", encoding="utf-8")
@@ -0,0 +1,46 @@
+import datetime
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# The modules under test are scripts in the repository's top folder, rather than an installed package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from canon import get_canon
+from create_plan import START_DATE, ChapterIndex, PlanPosition, PlanSpec, get_book_groups, get_plan_spec
+
+# Number of random cases each test that compares a closed-form lookup with the plan matrix checks
+CASES = 100
+
+
+@pytest.fixture(scope="session")
+def chapter_index() -> ChapterIndex:
+    return ChapterIndex(get_canon())
+
+
+@pytest.fixture(scope="session")
+def plan_spec(chapter_index: ChapterIndex) -> PlanSpec:
+    """The plan spec of the default groups"""
+    return get_plan_spec(get_book_groups(), chapter_index)
+
+
+@pytest.fixture
+def rng(request: pytest.FixtureRequest) -> random.Random:
+    """A random number generator seeded with the test's id, so that each test checks the same cases every run"""
+    return random.Random(request.node.nodeid)
+
+
+def get_random_date(rng: random.Random, date: datetime.date, days: int) -> datetime.date:
+    """Returns a random date less than days days before or after date"""
+    return date + datetime.timedelta(days=rng.randrange(1 - days, days))
+
+
+def get_random_position(rng: random.Random, plan_spec: PlanSpec) -> PlanPosition:
+    """Returns each group at a random position, on a random date within a few years of START_DATE"""
+
+    return plan_spec.get_position(
+        get_random_date(rng, START_DATE, 1000),
+        {group.group_name: rng.randrange(len(group.chapter_ids)) for group in plan_spec.groups},
+    )
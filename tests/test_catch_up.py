@@ -0,0 +1,79 @@
+import datetime
+import random
+
+import pytest
+
+from catch_up import CATCH_UP_POLICIES, get_catch_up
+from conftest import CASES, get_random_date, get_random_position
+from create_plan import START_DATE
+
+
+def get_random_case(rng: random.Random, plan_spec):
+    """Returns a random plan position, along with a random last completed day (some before the position's date) and a
+    day the reader's back, after missing anywhere from none to a few years of days"""
+
+    plan_position = get_random_position(rng, plan_spec)
+    last_completed_date = get_random_date(rng, plan_position.date, 400)
+    missed_days = rng.choice([0, rng.randrange(30), rng.randrange(2000)])
+    back_date = last_completed_date + datetime.timedelta(days=1 + missed_days)
+    return plan_position, last_completed_date, back_date
+
+
+def test_spread_catch_up_matches_plan_matrix(plan_spec, rng):
+    for _ in range(CASES):
+        plan_position, last_completed_date, back_date = get_random_case(rng, plan_spec)
+        catch_up = get_catch_up(
+            plan_spec, plan_position, last_completed_date, back_date, "spread", rng.randint(1, 10)
+        )
+        dates = [back_date + datetime.timedelta(days=day) for day in range((catch_up.end_date - back_date).days + 5)]
+        days_chapter_ids = [catch_up.get_chapter_ids(plan_spec, date) for date in dates]
+
+        for group_index in range(len(plan_spec.groups)):
+            # The reader reads the group's chapters in the plan's order from where they left off, with no gaps
+            chapter_ids = [
+                chapter_id for group_chapter_ids in days_chapter_ids for chapter_id in group_chapter_ids[group_index]
+            ]
+            plan_matrix = plan_spec.get_plan_matrix(
+                plan_position,
+                last_completed_date + datetime.timedelta(days=1),
+                last_completed_date + datetime.timedelta(days=len(chapter_ids)),
+            )
+            assert chapter_ids == plan_matrix[:, group_index].tolist()
+
+        # From the last day of the spread on, the reader's back on the plan's own readings
+        plan_matrix = plan_spec.get_plan_matrix(plan_position, catch_up.end_date, dates[-1])
+        for date, chapter_ids in zip(dates[dates.index(catch_up.end_date) :], plan_matrix.tolist()):
+            assert [group_chapter_ids[-1] for group_chapter_ids in days_chapter_ids[dates.index(date)]] == chapter_ids
+        for date in dates[dates.index(catch_up.end_date) + 1 :]:
+            assert catch_up.get_position(plan_spec, date) == plan_spec.move(plan_position, date)
+
+
+def test_skip_and_resume_catch_ups_match_plan_matrix(plan_spec, rng):
+    for _ in range(CASES):
+        plan_position, last_completed_date, back_date = get_random_case(rng, plan_spec)
+        days = rng.randrange(1, 30)
+        dates = [back_date + datetime.timedelta(days=day) for day in range(days)]
+
+        # Skipping reads what the plan says from the day the reader's back, and resuming what it said from the day
+        # after the last completed one
+        for policy, first_date in [("skip", back_date), ("resume", last_completed_date + datetime.timedelta(days=1))]:
+            catch_up = get_catch_up(plan_spec, plan_position, last_completed_date, back_date, policy)
+            plan_matrix = plan_spec.get_plan_matrix(
+                plan_position, first_date, first_date + datetime.timedelta(days=days - 1)
+            )
+            assert [catch_up.get_chapter_ids(plan_spec, date) for date in dates] == [
+                [[chapter_id] for chapter_id in chapter_ids] for chapter_ids in plan_matrix.tolist()
+            ]
+
+
+@pytest.mark.parametrize("policy", CATCH_UP_POLICIES)
+def test_dates_before_the_reader_is_back_are_rejected(plan_spec, policy):
+    plan_position = plan_spec.get_position(START_DATE)
+    back_date = START_DATE + datetime.timedelta(days=30)
+    catch_up = get_catch_up(plan_spec, plan_position, START_DATE + datetime.timedelta(days=9), back_date, policy)
+    date = back_date - datetime.timedelta(days=1)
+
+    with pytest.raises(ValueError):
+        catch_up.get_position(plan_spec, date)
+    with pytest.raises(ValueError):
+        catch_up.get_chapter_ids(plan_spec, date)
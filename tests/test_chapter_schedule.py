@@ -0,0 +1,52 @@
+import datetime
+import random
+
+import numpy as np
+
+from chapter_schedule import get_coverage_counts, get_reading_dates
+from conftest import CASES, get_random_date, get_random_position
+from create_plan import START_DATE
+
+
+def get_random_case(rng: random.Random, plan_spec):
+    """Returns a random plan position, along with a random range of days (some of which start before it)"""
+
+    plan_position = get_random_position(rng, plan_spec)
+    from_date = get_random_date(rng, plan_position.date, 400)
+    to_date = from_date + datetime.timedelta(days=rng.randrange(0, 800))
+    return plan_position, from_date, to_date
+
+
+def test_get_reading_dates_matches_plan_matrix(chapter_index, plan_spec, rng):
+    for _ in range(CASES):
+        plan_position, from_date, to_date = get_random_case(rng, plan_spec)
+        plan_matrix = plan_spec.get_plan_matrix(plan_position, from_date, to_date)
+        chapter_id = rng.randrange(len(chapter_index.readings))
+
+        expected_reading_dates = sorted(
+            (from_date + datetime.timedelta(days=day), plan_spec.group_names[group_index])
+            for day, group_index in np.argwhere(plan_matrix == chapter_id).tolist()
+        )
+        assert get_reading_dates(chapter_id, from_date, to_date, plan_spec, plan_position) == expected_reading_dates
+
+
+def test_get_coverage_counts_matches_plan_matrix(chapter_index, plan_spec, rng):
+    for _ in range(CASES):
+        plan_position, from_date, to_date = get_random_case(rng, plan_spec)
+        plan_matrix = plan_spec.get_plan_matrix(plan_position, from_date, to_date)
+
+        expected_coverage_counts = [0] * len(chapter_index.readings)
+        for chapter_id in plan_matrix.flat:
+            expected_coverage_counts[chapter_id] += 1
+        assert (
+            get_coverage_counts(from_date, to_date, plan_spec, plan_position, chapter_index) == expected_coverage_counts
+        )
+
+
+def test_empty_range_has_no_readings(chapter_index, plan_spec):
+    plan_position = plan_spec.get_position(START_DATE)
+    from_date = START_DATE + datetime.timedelta(days=10)
+    to_date = from_date - datetime.timedelta(days=1)
+
+    assert get_reading_dates(0, from_date, to_date, plan_spec, plan_position) == []
+    assert not any(get_coverage_counts(from_date, to_date, plan_spec, plan_position, chapter_index))
@@ -0,0 +1,66 @@
+import pytest
+
+from conftest import CASES, get_random_date, get_random_position
+from create_plan import get_readings_for_date, read_plan_config
+
+
+def test_get_readings_for_date_matches_plan_matrix(chapter_index, plan_spec, rng):
+    for _ in range(CASES):
+        plan_position = get_random_position(rng, plan_spec)
+        # Up to a few centuries either side of the position's date
+        date = get_random_date(rng, plan_position.date, 100_000)
+
+        chapter_ids = plan_spec.get_plan_matrix(plan_position, date, date)[0].tolist()
+        assert get_readings_for_date(date, chapter_index, plan_spec, plan_position) == {
+            "Date": str(date),
+            **{
+                group_name: chapter_index.readings[chapter_id]
+                for group_name, chapter_id in zip(plan_spec.group_names, chapter_ids)
+            },
+        }
+
+
+@pytest.mark.parametrize(
+    "plan_config_text",
+    [
+        'start_date = 5',
+        '[[groups]]\nname = "Psalms"\nbooks = ["Psalms"]\nreading_index = "x"',
+        '[[groups]]\nname = "Psalms"\nbooks = ["Psalms"]\nreading_index = true',
+        '[[groups]]\nname = "Psalms"\nbooks = "Psalms"',
+        '[[groups]]\nname = 5\nbooks = ["Psalms"]',
+        '[[groups]]\nname = "Psalms"\nbooks = []',
+        '[[groups]]\nname = "Psalms"\nbooks = ["Psalms"]\nbook = ["Proverbs"]',
+        '[[groups]]\nname = "Psalms"\nbooks = ["Psalms"]\n[[groups]]\nname = "Psalms"\nbooks = ["Proverbs"]',
+        'groups = ["Psalms"]',
+        'outputs = "raw_csv"',
+        'outputs = ["raw_csv", 5]',
+        '[abbreviations]\nPsalms = 5',
+    ],
+)
+def test_read_plan_config_rejects_bad_settings(chapter_index, tmp_path, plan_config_text):
+    plan_config_filename = tmp_path / "plan.toml"
+    plan_config_filename.write_text(plan_config_text, encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        read_plan_config(plan_config_filename, chapter_index.books)
+
+
+def test_read_plan_config(chapter_index, tmp_path):
+    plan_config_filename = tmp_path / "plan.toml"
+    plan_config_filename.write_text(
+        'end_date = 2023-06-30\noutputs = ["raw_csv"]\n[abbreviations]\nPsalms = "Ps"\n'
+        '[[groups]]\nname = "Psalms"\nbooks = ["Psalms"]\nreading_index = 22',
+        encoding="utf-8",
+    )
+
+    plan_config = read_plan_config(plan_config_filename, chapter_index.books)
+    assert [book_group.book_list for book_group in plan_config.book_groups] == [["Psalms"]]
+    assert plan_config.reading_indexes == {"Psalms": 22}
+    assert plan_config.abbreviations == {"Psalms": "Ps"}
+    assert plan_config.outputs == ["raw_csv"]
+
+
+def test_cycle_arrays_are_read_only(plan_spec):
+    for cycle_array in plan_spec.cycle_arrays:
+        with pytest.raises(ValueError):
+            cycle_array[0] = 0
@@ -0,0 +1,26 @@
+import datetime
+
+from create_user_plans import UserPlanConfig, read_user_plan_configs
+
+
+def test_read_user_plan_configs_reports_bad_rows(tmp_path):
+    users_filename = tmp_path / "users.csv"
+    users_filename.write_text(
+        "user,start_date,end_date,Gospels\n"
+        "alice,2024-01-01,2024-12-31,\n"
+        "../bob,2024-01-01,2024-12-31,\n"
+        "carol,2024-13-01,2024-12-31,\n"
+        "dave,2024-01-01,2024-12-31,x\n"
+        "alice,2024-01-01,2024-12-31,3\n"
+        "erin,2024-12-31,2024-01-01,\n"
+        "frank,2024-01-01\n"
+        "grace,2024-01-01,2024-12-31,28\n",
+        encoding="utf-8",
+    )
+
+    user_plan_configs, errors = read_user_plan_configs(str(users_filename), ["Gospels", "Psalms"])
+    assert user_plan_configs == [
+        UserPlanConfig("alice", datetime.date(2024, 1, 1), datetime.date(2024, 12, 31)),
+        UserPlanConfig("grace", datetime.date(2024, 1, 1), datetime.date(2024, 12, 31), {"Gospels": 28}),
+    ]
+    assert list(errors) == ["line 3", "carol", "dave", "line 6", "erin", "frank"]
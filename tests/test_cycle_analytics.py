@@ -0,0 +1,79 @@
+import datetime
+import random
+
+import numpy as np
+
+from conftest import CASES, get_random_date, get_random_position
+from create_plan import BookGroup, ChapterIndex, get_plan_spec
+from cycle_analytics import get_next_coincidence, get_next_realignment, get_plan_period
+
+# Short books, so that the synthetic plans repeat within a few thousand days, and can be searched day by day
+SHORT_BOOKS = ["Ruth", "Joel", "Obadiah", "Jonah", "Nahum", "Habakkuk", "Haggai", "Titus", "Philemon", "Jude", "Micah"]
+
+
+def get_random_case(rng: random.Random, chapter_index: ChapterIndex):
+    """Returns a random plan of 2 to 4 groups of short books (which may share books), a random position in it and a
+    random day to search from"""
+
+    book_groups = [
+        BookGroup(f"Group{group_number + 1}", rng.sample(SHORT_BOOKS, rng.randint(1, 3)))
+        for group_number in range(rng.randint(2, 4))
+    ]
+    plan_spec = get_plan_spec(book_groups, chapter_index)
+    plan_position = get_random_position(rng, plan_spec)
+    return plan_spec, plan_position, get_random_date(rng, plan_position.date, 400)
+
+
+def get_first_day(plan_position, from_date: datetime.date, days_found: np.ndarray) -> int | None:
+    """Returns the first of the days found (in a plan matrix starting on from_date), counted from the position's date"""
+
+    if not days_found.any():
+        return None
+    return (from_date - plan_position.date).days + int(days_found.argmax())
+
+
+def test_get_plan_period_matches_plan_matrix(chapter_index, rng):
+    for _ in range(CASES):
+        plan_spec, plan_position, _ = get_random_case(rng, chapter_index)
+        plan_period = get_plan_period(plan_spec)
+        plan_matrix = plan_spec.get_plan_matrix(
+            plan_position, plan_position.date, plan_position.date + datetime.timedelta(days=plan_period)
+        )
+
+        assert (plan_matrix[plan_period] == plan_matrix[0]).all()
+        assert not (plan_matrix[1:plan_period] == plan_matrix[0]).all(axis=1).any()
+
+
+def test_get_next_realignment_matches_plan_matrix(chapter_index, rng):
+    for _ in range(CASES):
+        plan_spec, plan_position, from_date = get_random_case(rng, chapter_index)
+        group_names = rng.sample(plan_spec.group_names, rng.randint(1, len(plan_spec.groups)))
+        group_indexes = [plan_spec.group_names.index(group_name) for group_name in group_names]
+        plan_matrix = plan_spec.get_plan_matrix(
+            plan_position, from_date, from_date + datetime.timedelta(days=get_plan_period(plan_spec))
+        )
+
+        first_chapter_ids = [plan_spec.groups[group_index].chapter_ids[0] for group_index in group_indexes]
+        days_realigned = (plan_matrix[:, group_indexes] == first_chapter_ids).all(axis=1)
+        assert get_next_realignment(from_date, plan_spec, plan_position, group_names) == get_first_day(
+            plan_position, from_date, days_realigned
+        )
+
+
+def test_get_next_coincidence_matches_plan_matrix(chapter_index, rng):
+    for _ in range(CASES):
+        plan_spec, plan_position, from_date = get_random_case(rng, chapter_index)
+        plan_chapter_ids = sorted({chapter_id for group in plan_spec.groups for chapter_id in group.chapter_ids})
+        chapter_ids = rng.sample(plan_chapter_ids, min(len(plan_chapter_ids), rng.randint(1, 3)))
+        plan_matrix = plan_spec.get_plan_matrix(
+            plan_position, from_date, from_date + datetime.timedelta(days=get_plan_period(plan_spec))
+        )
+
+        # The chapters are distinct, and each group reads one chapter a day, so they're all read by different groups
+        days_coinciding = np.all([(plan_matrix == chapter_id).any(axis=1) for chapter_id in chapter_ids], axis=0)
+        assert get_next_coincidence(from_date, plan_spec, plan_position, chapter_ids) == get_first_day(
+            plan_position, from_date, days_coinciding
+        )
+        assert get_next_coincidence(from_date, plan_spec, plan_position, chapter_ids * 2) == get_first_day(
+            plan_position, from_date, days_coinciding
+        )
@@ -0,0 +1,54 @@
+import datetime
+import functools
+
+import pytest
+
+from canon import get_canon
+from create_plan import START_DATE, ReadingsCsvSink, write_days
+from output_scheduler import OutputJob, write_outputs
+from plan_database import PlanDatabaseSink
+from plan_file import PlanFileSink
+
+END_DATE = START_DATE + datetime.timedelta(days=999)
+
+
+def get_days_readings(date: datetime.date, chapter_ids: list[int], fail_on: datetime.date | None = None) -> list[str]:
+    if date == fail_on:
+        raise ValueError(f"Can't format {date}")
+    return [str(date), *map(str, chapter_ids)]
+
+
+def get_csv_sink(filename, fail_on: datetime.date | None = None) -> ReadingsCsvSink:
+    return ReadingsCsvSink(
+        str(filename), ["Date", "Gospels", "Psalms"], functools.partial(get_days_readings, fail_on=fail_on)
+    )
+
+
+def test_failed_output_is_deleted_and_others_are_written(tmp_path, plan_spec):
+    plan_matrix = plan_spec.get_plan_matrix(plan_spec.get_position(START_DATE), START_DATE, END_DATE)[:, :2].copy()
+    output_jobs = [
+        OutputJob("failing.csv", functools.partial(get_csv_sink, tmp_path / "failing.csv", END_DATE)),
+        OutputJob("plan.csv", functools.partial(get_csv_sink, tmp_path / "plan.csv")),
+        OutputJob(
+            "plan.plan",
+            functools.partial(PlanFileSink, tmp_path / "plan.plan", START_DATE, END_DATE, ["Gospels", "Psalms"]),
+        ),
+    ]
+
+    errors = write_outputs(START_DATE, plan_matrix, output_jobs, max_processes=1)
+    assert list(errors) == ["failing.csv"]
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["plan.csv", "plan.plan"]
+    assert len((tmp_path / "plan.csv").read_text(encoding="utf-8").splitlines()) == len(plan_matrix) + 1
+
+
+def test_write_days_aborts_every_sink_when_one_fails(tmp_path):
+    sinks = [
+        get_csv_sink(tmp_path / "plan.csv"),
+        PlanDatabaseSink(tmp_path / "plan.sqlite", ["Gospels", "Psalms"], get_canon()),
+        get_csv_sink(tmp_path / "failing.csv", START_DATE + datetime.timedelta(days=5)),
+    ]
+    days = ((START_DATE + datetime.timedelta(days=day), [day, day + 1]) for day in range(10))
+
+    with pytest.raises(ValueError):
+        write_days(days, sinks)
+    assert list(tmp_path.iterdir()) == []
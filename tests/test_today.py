@@ -0,0 +1,68 @@
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import today
+from conftest import CASES, get_random_date
+from create_plan import START_DATE, get_readings_for_date
+
+# today.py's budgets: for its own imports (as reported by python -X importtime), and for the whole run from a cold start
+TODAY_IMPORT_BUDGET_SECONDS = 0.015
+TODAY_RUN_BUDGET_SECONDS = 0.05
+# The fastest of this many runs is held to each budget, so that a busy machine doesn't fail the test
+TODAY_RUNS = 10
+# Modules too slow to import for today.py to ever depend on
+TODAY_UNWANTED_MODULES = {"numpy", "prettytable", "create_plan", "argparse", "csv", "json", "pathlib"}
+
+TODAY_FILENAME = str(Path(today.__file__).resolve())
+
+
+def get_today_import_seconds() -> tuple[float, set[str]]:
+    """Returns the time python -X importtime reports for importing today.py, and the modules it imported"""
+
+    import_times = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import today"],
+        capture_output=True,
+        check=True,
+        cwd=Path(TODAY_FILENAME).parent,
+        text=True,
+    ).stderr.splitlines()
+
+    # Each line is like "import time:       659 |        783 |   operator", after a heading line
+    imported_modules: set[str] = set()
+    today_import_microseconds = 0
+    for import_time in import_times[1:]:
+        _, cumulative_microseconds, module = import_time.split("|")
+        imported_modules.add(module.strip())
+        if module.strip() == "today":
+            today_import_microseconds = int(cumulative_microseconds)
+
+    return today_import_microseconds / 1_000_000, imported_modules
+
+
+def test_today_imports_only_what_it_needs():
+    import_seconds, imported_modules = min(get_today_import_seconds() for _ in range(TODAY_RUNS))
+
+    assert not imported_modules & TODAY_UNWANTED_MODULES
+    assert import_seconds <= TODAY_IMPORT_BUDGET_SECONDS
+
+
+def test_today_runs_within_budget():
+    run_seconds: list[float] = []
+    for _ in range(TODAY_RUNS):
+        start_time = time.perf_counter()
+        subprocess.run([sys.executable, TODAY_FILENAME], capture_output=True, check=True)
+        run_seconds.append(time.perf_counter() - start_time)
+
+    assert min(run_seconds) <= TODAY_RUN_BUDGET_SECONDS
+
+
+def test_get_readings_for_day_matches_create_plan(chapter_index, plan_spec, rng):
+    for _ in range(CASES):
+        start_date = get_random_date(rng, START_DATE, 1000)
+        date = get_random_date(rng, start_date, 100_000)
+
+        readings = get_readings_for_date(date, chapter_index, plan_spec, plan_spec.get_position(start_date))
+        del readings["Date"]
+        assert today.get_readings_for_day(date, start_date) == readings
@@ -0,0 +1,54 @@
+"""Prints the plan's readings for a day (by default, today), quickly enough to run from a shell prompt or a login hook
+
+It imports only what the closed-form lookup needs, and takes the chapter counts from the canon's pregenerated constants.
+"""
+
+import datetime
+import sys
+from types import MappingProxyType
+
+from canon import get_canon
+from plan_defaults import BOOK_GROUPS, START_DATE
+
+USAGE = "usage: today.py [DATE]\n\nPrints the plan's readings for DATE (YYYY-MM-DD), or for today"
+
+
+def get_reading(book_list: list[str], chapter_counts: MappingProxyType[str, int], days_elapsed: int) -> str:
+    """Returns the group's reading days_elapsed days after it read the first chapter of its first book"""
+
+    position = days_elapsed % sum(chapter_counts[book] for book in book_list)
+    for book in book_list:
+        if position < chapter_counts[book]:
+            break
+        position -= chapter_counts[book]
+
+    return f"{book} {position + 1}"
+
+
+def get_readings_for_day(date: datetime.date, start_date: datetime.date = START_DATE) -> dict[str, str]:
+    """Returns each group's reading on date, in the plan that starts on start_date"""
+
+    chapter_counts = get_canon().chapter_counts
+    days_elapsed = (date - start_date).days
+    return {
+        group_name: get_reading(book_list, chapter_counts, days_elapsed)
+        for group_name, book_list in BOOK_GROUPS.items()
+    }
+
+
+def main():
+    if len(sys.argv) > 2 or sys.argv[1:] in (["-h"], ["--help"]):
+        print(USAGE)
+        return
+    try:
+        date = datetime.date.fromisoformat(sys.argv[1]) if len(sys.argv) == 2 else datetime.date.today()
+    except ValueError:
+        sys.exit(f"{USAGE}\n\nThe date ('{sys.argv[1]}') must be in the YYYY-MM-DD format.")
+
+    print(f"Readings for {date:%a %Y-%m-%d}")
+    for group_name, reading in get_readings_for_day(date).items():
+        print(f"\t{group_name}: {reading}")
+
+
+if __name__ == "__main__":
+    main()